@@ -3,7 +3,8 @@ Streamlit 应用程序 - AI 图像生成器和识别助手
 """
 
 import os
-import json
+import shutil
+import orjson
 import streamlit as st
 import random
 from src.services.image_generator import (
@@ -13,16 +14,41 @@ from src.services.image_generator import (
     validate_workflow_id,
     validate_prompt
 )
-from qwen_api import QwenAPI, TASK_TYPES
 import logging
-from PIL import Image
+from PIL import Image, ImageOps
 from io import BytesIO
+from pathlib import Path
 import tempfile
+import uuid
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 工作流配置文件
+WORKFLOWS_FILE = "workflows.json"
+
+# 上传文件临时目录的根目录，每个会话在其下拥有独立子目录；
+# 设置环境变量 UPLOAD_TEMP_ROOT=/dev/shm/aitool 可改用内存文件系统，写入和删除都不落盘。
+# 默认使用磁盘目录：Docker 容器的 /dev/shm 默认只有 64MB，多个会话同时上传时容易写满
+UPLOAD_TEMP_ROOT = os.getenv("UPLOAD_TEMP_ROOT", "temp")
+
+# 工作流配置中的 type 字段到工作流类型的映射，未知类型按文生图处理
+_WORKFLOW_TYPE_MAP = {
+    'image_to_image': WorkflowType.IMAGE_TO_IMAGE,
+    'text_to_image': WorkflowType.TEXT_TO_IMAGE,
+}
+
+# 图像识别任务类型选项
+RECOGNITION_TASK_OPTIONS = ("通用识别", "人脸识别", "文字识别", "物体检测")
+
+# 允许上传的图片 MIME 类型及大小上限
+ALLOWED_IMAGE_TYPES = frozenset({"image/png", "image/jpeg", "image/jpg"})
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+
 # 默认提示词配置
 DEFAULT_PROMPTS = {
     "text_to_image": [
@@ -56,22 +82,176 @@ def get_random_prompt(workflow_type):
     else:
         return random.choice(DEFAULT_PROMPTS["text_to_image"])
 
-def load_workflows():
+def _workflows_mtime():
     """
-    加载工作流配置
+    获取工作流配置文件的修改时间，文件不存在时返回 None
+    """
+    try:
+        return os.path.getmtime(WORKFLOWS_FILE)
+    except OSError:
+        return None
+
+@st.cache_data(show_spinner=False, ttl=300)
+def _read_workflows(config_mtime):
+    """
+    读取并解析工作流配置文件
     
+    参数:
+        config_mtime: float, 配置文件修改时间，仅作为缓存键使用，文件被修改后缓存自动失效
+        
     返回:
         dict: 工作流配置字典
+        
+    异常:
+        OSError, orjson.JSONDecodeError: 读取或解析失败时（失败结果不会被缓存）
+    """
+    workflows = orjson.loads(Path(WORKFLOWS_FILE).read_bytes())
+    logger.debug("加载的工作流配置: %s", workflows)
+    return workflows
+
+def load_workflows():
+    """
+    加载工作流配置（按文件修改时间缓存，避免每次重新运行脚本都读取解析文件）
+    
+    返回:
+        dict: 工作流配置字典，读取失败时返回空字典
     """
     try:
-        with open("workflows.json", "r", encoding="utf-8") as f:
-            workflows = json.load(f)
-            print("加载的工作流配置:", workflows)  # 添加日志
-            return workflows
-    except Exception as e:
-        print(f"加载工作流配置出错: {str(e)}")  # 添加错误日志
+        return _read_workflows(_workflows_mtime())
+    except Exception:
+        # 异常不会被 st.cache_data 缓存，下次重新运行时会再次尝试读取
+        logger.exception("加载工作流配置出错")
         return {}
 
+@st.cache_resource(show_spinner=False)
+def get_generation_semaphore():
+    """
+    获取图像生成并发限制信号量，所有会话共享，避免多个用户同时生成时触发API限流
+    
+    返回:
+        threading.BoundedSemaphore: 最多允许2个生成任务同时进行
+    """
+    return threading.BoundedSemaphore(2)
+
+@st.cache_resource(show_spinner=False)
+def get_qwen_client(api_key=None):
+    """
+    获取通义千问API客户端，按 API 密钥缓存，在多次重新运行和会话之间复用
+    
+    参数:
+        api_key: str, 可选，API密钥，不提供则从环境变量读取
+        
+    返回:
+        QwenAPI: 千问API客户端
+    """
+    # 延迟导入：客户端在首次提交分析请求时才创建，未使用图像识别的会话无需加载千问API模块
+    from qwen_api import QwenAPI
+    return QwenAPI(api_key=api_key)
+
+def get_session_temp_dir():
+    """
+    获取当前会话专用的临时目录（首次调用时在 UPLOAD_TEMP_ROOT 下创建）
+    
+    返回:
+        str: 临时目录路径
+    """
+    if "tmpdir" not in st.session_state:
+        os.makedirs(UPLOAD_TEMP_ROOT, exist_ok=True)
+        st.session_state.tmpdir = tempfile.mkdtemp(dir=UPLOAD_TEMP_ROOT)
+    else:
+        # 长时间空闲的会话目录可能已被后台清理线程删除
+        os.makedirs(st.session_state.tmpdir, exist_ok=True)
+    return st.session_state.tmpdir
+
+def _sweep_temp_dir(root, ttl, batch_size, pause):
+    """
+    删除目录树中超过 ttl 秒未修改的文件和空目录
+    
+    参数:
+        root: str, 要清理的根目录
+        ttl: float, 文件保留时长（秒）
+        batch_size: int, 每删除多少个条目暂停一次
+        pause: float, 每批之间暂停的秒数，避免长时间占用磁盘 I/O
+        
+    返回:
+        int: 删除的条目数
+    """
+    cutoff = time.time() - ttl
+    removed = 0
+    try:
+        entries = os.scandir(root)
+    except FileNotFoundError:
+        return 0
+    with entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    removed += _sweep_temp_dir(entry.path, ttl, batch_size, pause)
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.rmdir(entry.path)
+                        removed += 1
+                        if removed % batch_size == 0:
+                            time.sleep(pause)
+                elif entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+                    if removed % batch_size == 0:
+                        time.sleep(pause)
+            except OSError:
+                # 目录非空或文件已被删除，跳过
+                continue
+    return removed
+
+def _temp_janitor(root, ttl, batch_size, pause, interval=300):
+    """后台线程：定期清理过期的上传临时文件"""
+    while True:
+        try:
+            removed = _sweep_temp_dir(root, ttl, batch_size, pause)
+            if removed:
+                logger.info(f"已清理过期临时文件: {removed} 个")
+        except Exception as e:
+            logger.warning(f"清理临时文件时出错: {str(e)}")
+        time.sleep(interval)
+
+@st.cache_resource(show_spinner=False)
+def start_temp_janitor():
+    """
+    启动临时文件清理线程（每个进程只启动一次），
+    保证异常路径上遗留的上传文件最终也会被删除
+    """
+    thread = threading.Thread(
+        target=_temp_janitor,
+        args=(UPLOAD_TEMP_ROOT, 3600, 100, 0.05),
+        name="temp-janitor",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+@st.cache_resource(show_spinner=False)
+def get_io_pool():
+    """
+    获取后台文件操作线程池（每个进程只创建一次），删除文件等操作不阻塞脚本线程
+    
+    返回:
+        ThreadPoolExecutor: 线程池
+    """
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-io")
+
+def _remove_quietly(path):
+    """
+    删除文件，文件已不存在时忽略
+    
+    参数:
+        path: str, 文件路径
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"删除临时文件失败 {path}: {str(e)}")
+
 def save_uploaded_file(uploaded_file):
     """
     保存上传的文件到临时目录
@@ -83,17 +263,14 @@ def save_uploaded_file(uploaded_file):
         str: 临时文件的路径
     """
     try:
-        # 创建临时目录（如果不存在）
-        temp_dir = "temp"
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        # 生成临时文件路径
+        # 生成临时文件路径（每个会话独立目录、每次上传唯一文件名，避免并发会话互相覆盖）
         file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-        temp_path = os.path.join(temp_dir, f"{uploaded_file.name}")
+        temp_path = os.path.join(get_session_temp_dir(), f"{uuid.uuid4().hex}{file_extension}")
         
-        # 保存文件
+        # 分块写入文件，避免一次性把整个上传内容复制到内存
+        uploaded_file.seek(0)
         with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+            shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
             
         logger.info(f"文件已保存到: {temp_path}")
         return temp_path
@@ -112,13 +289,11 @@ def validate_image_file(file):
         ValueError: 当文件格式不支持或大小超限时
     """
     # 检查文件类型
-    allowed_types = {"image/png", "image/jpeg", "image/jpg"}
-    if file.type not in allowed_types:
+    if file.type not in ALLOWED_IMAGE_TYPES:
         raise ValueError(f"不支持的文件类型: {file.type}。支持的类型: PNG, JPEG, JPG")
     
     # 检查文件大小（限制为10MB）
-    max_size = 10 * 1024 * 1024  # 10MB in bytes
-    if file.size > max_size:
+    if file.size > MAX_UPLOAD_SIZE:
         raise ValueError(f"文件过大: {file.size / 1024 / 1024:.2f}MB。最大允许: 10MB")
 
 def display_image(image_path, key_suffix="default"):
@@ -130,38 +305,41 @@ def display_image(image_path, key_suffix="default"):
         key_suffix: str, 用于创建唯一按钮key的后缀
     """
     try:
-        # 显示图片
-        image = Image.open(image_path)
-        st.image(image, caption="生成的图片", use_column_width=True)
+        # 读取一次图片内容，同时用于显示和下载，无需经 PIL 解码再重新编码
+        with open(image_path, "rb") as f:
+            image_bytes = f.read()
+        st.image(image_bytes, caption="生成的图片", use_column_width=True)
         
         # 添加下载按钮
-        with open(image_path, "rb") as file:
-            btn = st.download_button(
-                label="下载图片",
-                data=file,
-                file_name=os.path.basename(image_path),
-                mime="image/png",
-                key=f"download_btn_{key_suffix}"
-            )
+        st.download_button(
+            label="下载图片",
+            data=image_bytes,
+            file_name=os.path.basename(image_path),
+            mime="image/png",
+            key=f"download_btn_{key_suffix}"
+        )
     except Exception as e:
         logger.error(f"显示图片时出错: {str(e)}")
         st.error(f"显示图片时出错: {str(e)}")
 
 def get_workflow_type(workflow):
-    workflow_type = workflow.get('type', '')
-    if workflow_type == 'image_to_image':
-        return WorkflowType.IMAGE_TO_IMAGE
-    elif workflow_type == 'text_to_image':
-        return WorkflowType.TEXT_TO_IMAGE
-    else:
-        return WorkflowType.TEXT_TO_IMAGE
+    return _WORKFLOW_TYPE_MAP.get(workflow.get('type', ''), WorkflowType.TEXT_TO_IMAGE)
 
 def render_workflow_tab(workflow_id, workflow):
     workflow_type = get_workflow_type(workflow)
     
-    # 创建状态变量，用于存储生成的图片路径
-    if 'generated_image_path' not in st.session_state:
-        st.session_state.generated_image_path = None
+    # 创建状态变量，用于存储生成的图片内容和文件名
+    if 'generated_image_bytes' not in st.session_state:
+        st.session_state.generated_image_bytes = None
+        st.session_state.generated_image_name = None
+    
+    # 默认提示词在会话内保持不变，只有点击“换一个”时才重新随机选择
+    default_prompt_key = f"default_prompt_{workflow_id}"
+    if st.button("换一个示例提示词", key=f"shuffle_prompt_{workflow_id}"):
+        st.session_state.pop(default_prompt_key, None)
+    if default_prompt_key not in st.session_state:
+        st.session_state[default_prompt_key] = get_random_prompt(workflow_type)
+    default_prompt = st.session_state[default_prompt_key]
     
     with st.form(key=f"form_{workflow_id}"):
         if workflow_type == WorkflowType.IMAGE_TO_IMAGE:
@@ -169,9 +347,6 @@ def render_workflow_tab(workflow_id, workflow):
             if uploaded_file:
                 st.image(uploaded_file, caption="上传的图片")
         
-        # 获取默认提示词
-        default_prompt = get_random_prompt(workflow_type)
-        
         # 添加提示词输入框，使用默认提示词作为占位符
         prompt = st.text_area("提示词", 
                             placeholder=f"示例提示词：{default_prompt}",
@@ -197,37 +372,37 @@ def render_workflow_tab(workflow_id, workflow):
                     # 如果是图生图，保存上传的图片
                     reference_image_path = None
                     if workflow_type == WorkflowType.IMAGE_TO_IMAGE and uploaded_file:
-                        temp_dir = "temp"
-                        os.makedirs(temp_dir, exist_ok=True)
-                        reference_image_path = os.path.join(temp_dir, uploaded_file.name)
-                        with open(reference_image_path, "wb") as f:
-                            f.write(uploaded_file.getvalue())
+                        reference_image_path = save_uploaded_file(uploaded_file)
                     
                     # 使用用户输入的提示词或默认提示词
                     final_prompt = prompt if prompt else default_prompt
                     
-                    # 生成图片
-                    output_path = generate_image_runninghub(
-                        workflow_id=str(workflow_id),  # 确保 workflow_id 是字符串
-                        workflow_config=workflow,  # 传递完整的工作流配置
-                        prompt=final_prompt,
-                        negative_prompt=negative_prompt,
-                        seed=seed if seed != -1 else None,
-                        workflow_type=workflow_type,
-                        reference_image_path=reference_image_path
-                    )
+                    # 生成图片（全进程共享并发上限，超出时排队等待）
+                    with get_generation_semaphore():
+                        output_path = generate_image_runninghub(
+                            workflow_id=str(workflow_id),  # 确保 workflow_id 是字符串
+                            workflow_config=workflow,  # 传递完整的工作流配置
+                            prompt=final_prompt,
+                            negative_prompt=negative_prompt,
+                            seed=seed if seed != -1 else None,
+                            workflow_type=workflow_type,
+                            reference_image_path=reference_image_path
+                        )
                     
-                    # 清理临时文件
-                    if reference_image_path and os.path.exists(reference_image_path):
-                        os.remove(reference_image_path)
+                    # 在后台线程中清理临时文件
+                    if reference_image_path:
+                        get_io_pool().submit(_remove_quietly, reference_image_path)
                     
                     # 显示生成的图片
                     if isinstance(output_path, dict) and 'image_path' in output_path:
                         image_path = output_path['image_path']
                         if os.path.exists(image_path):
-                            st.session_state.generated_image_path = image_path
+                            # 生成完成时读取一次图片内容，之后的重新运行不再访问文件系统
+                            with open(image_path, "rb") as f:
+                                st.session_state.generated_image_bytes = f.read()
+                            st.session_state.generated_image_name = os.path.basename(image_path)
                             st.success("图片生成成功！")
-                            st.image(image_path, caption="生成的图片")
+                            st.image(st.session_state.generated_image_bytes, caption="生成的图片")
                     else:
                         st.error("图片生成失败，请重试")
                         
@@ -235,27 +410,90 @@ def render_workflow_tab(workflow_id, workflow):
                 st.error(f"发生错误: {str(e)}")
     
     # 表单外部添加下载按钮
-    if st.session_state.generated_image_path and os.path.exists(st.session_state.generated_image_path):
-        with open(st.session_state.generated_image_path, "rb") as file:
-            st.download_button(
-                label="下载图片",
-                data=file,
-                file_name=os.path.basename(st.session_state.generated_image_path),
-                mime="image/png",
-                key=f"download_btn_{workflow_id}"
-            )
+    if st.session_state.generated_image_bytes:
+        st.download_button(
+            label="下载图片",
+            data=st.session_state.generated_image_bytes,
+            file_name=st.session_state.generated_image_name,
+            mime="image/png",
+            key=f"download_btn_{workflow_id}"
+        )
+
+@st.cache_data(show_spinner=False)
+def preprocess_for_api(raw, max_edge=1024):
+    """
+    将图片缩放到最长边不超过 max_edge 并编码为 JPEG，减小发送给API的数据量
+    
+    参数:
+        raw: bytes, 原始图片数据
+        max_edge: int, 最长边像素上限
+        
+    返回:
+        bytes: JPEG 二进制数据
+    """
+    image = Image.open(BytesIO(raw))
+    
+    # Image.open 只解析文件头；已是尺寸合适的 RGB JPEG 时直接使用原始数据，无需解码再编码
+    if image.format == "JPEG" and image.mode == "RGB" and max(image.size) <= max_edge:
+        return raw
+    
+    # 重新编码会丢失 EXIF，先按方向标签把像素旋转到正确方向（手机照片常带方向标签）
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    
+    # JPEG 不支持透明通道：透明区域合成到白色背景上，而不是直接转换成黑色
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    else:
+        image = image.convert("RGB")
+    
+    out = BytesIO()
+    image.save(out, "JPEG", quality=90, optimize=True)
+    return out.getvalue()
+
+@st.cache_data(show_spinner=False)
+def analyze_image(image_bytes, task_type, custom_prompt=None):
+    """
+    调用千问API分析图片，按图片内容和任务参数缓存结果
+    
+    参数:
+        image_bytes: bytes, 图片二进制数据
+        task_type: str, 任务类型
+        custom_prompt: str, 可选，自定义提示词
+        
+    返回:
+        str: 分析结果
+        
+    异常:
+        RuntimeError: 当API返回错误时（st.cache_data 不缓存异常，失败的请求下次会重新调用API）
+    """
+    from qwen_api import TASK_TYPES
+    
+    qwen = get_qwen_client()
+    jpeg_bytes = preprocess_for_api(image_bytes)
+    
+    # 识别、作文、解题以外的任务类型按创意内容处理，未知类型默认为故事
+    if task_type not in TASK_TYPES:
+        task_type = "故事"
+    # 直接传入 JPEG 字节，只在 process_image_request 中做一次 base64 编码
+    response = qwen.process_image_request(
+        image_data=jpeg_bytes,
+        task_type=task_type,
+        custom_prompt=custom_prompt
+    )
+    
+    # 根据结构化的响应判断是否失败：失败时带 error 字段，成功时带 output 字段
+    if not isinstance(response, dict) or "error" in response or "output" not in response:
+        raise RuntimeError(qwen.parse_api_response(response))
+    return qwen.parse_api_response(response)
 
 def render_recognition_tab():
     """渲染图像识别选项卡"""
     st.header("图像识别")
     
-    # 初始化千问API客户端
-    try:
-        qwen = QwenAPI()
-    except ValueError as e:
-        st.error(str(e))
-        return
-    
     # 上传图片
     uploaded_file = st.file_uploader("上传图片进行识别", type=['png', 'jpg', 'jpeg'])
     
@@ -267,58 +505,34 @@ def render_recognition_tab():
             # 显示上传的图片
             st.image(uploaded_file, caption="上传的图片", use_column_width=True)
             
-            # 保存上传的图片
-            image_path = save_uploaded_file(uploaded_file)
-            
-            # 选择任务类型
-            task_type = st.selectbox(
-                "选择识别任务类型",
-                ["通用识别", "人脸识别", "文字识别", "物体检测"]
-            )
-            
-            # 自定义提示词
-            use_custom_prompt = st.checkbox("使用自定义提示词")
-            if use_custom_prompt:
-                custom_prompt = st.text_area("自定义提示词", help="请输入您的自定义提示词")
-            else:
-                custom_prompt = None
+            # 任务类型和提示词放在表单中，修改时不触发重新运行，提交时一次性读取
+            with st.form("analysis_form", clear_on_submit=False):
+                # 选择任务类型
+                task_type = st.selectbox(
+                    "选择识别任务类型",
+                    RECOGNITION_TASK_OPTIONS
+                )
+                
+                # 自定义提示词（留空则使用默认提示词）
+                custom_prompt = st.text_area("自定义提示词（可选）", help="请输入您的自定义提示词，留空则使用默认提示词")
+                custom_prompt = custom_prompt.strip() or None
+                
+                # 分析按钮
+                submitted = st.form_submit_button("开始分析")
             
-            # 分析按钮
-            if st.button("开始分析", key="analyze_image"):
+            if submitted:
                 with st.spinner("正在分析图片..."):
                     try:
-                        # 根据任务类型调用不同的处理函数
-                        if task_type == "识别":
-                            result = qwen.get_image_description(image_path=image_path)
-                        elif task_type == "作文":
-                            result = qwen.generate_essay(image_path=image_path, custom_prompt=custom_prompt)
-                        elif task_type == "解题":
-                            result = qwen.solve_problem(image_path=image_path, custom_prompt=custom_prompt)
-                        else:
-                            result = qwen.generate_creative_content(
-                                image_path=image_path,
-                                content_type=task_type,
-                                custom_prompt=custom_prompt
-                            )
-                        
-                        # 显示结果
-                        if "error" in str(result):
-                            st.error(result)
-                        else:
-                            st.success("分析完成！")
-                            st.write(result)
-                            
+                        result = analyze_image(uploaded_file.getvalue(), task_type, custom_prompt)
+                        st.success("分析完成！")
+                        st.write(result)
+                    except (RuntimeError, ValueError) as e:
+                        # RuntimeError: API返回错误；ValueError: 未配置千问API密钥
+                        st.error(str(e))
                     except Exception as e:
                         logger.exception("分析图片时出错")
                         st.error(f"分析图片时出错: {str(e)}")
                 
-            # 清理临时文件
-            try:
-                os.remove(image_path)
-                logger.info(f"已删除临时文件: {image_path}")
-            except Exception as e:
-                logger.warning(f"删除临时文件时出错: {str(e)}")
-                
         except ValueError as e:
             st.error(str(e))
         except Exception as e:
@@ -335,32 +549,35 @@ def main():
         st.set_page_config(page_title="AI 图像生成器和识别助手", layout="wide")
         st.title("AI 图像生成器和识别助手")
         
-        # 加载工作流配置
-        workflows = load_workflows()
-        if not workflows:
-            st.error("加载工作流配置失败")
-            return
-        
-        # 创建选项卡列表
-        tab_names = []
-        tab_workflows = []
+        # 启动临时文件清理线程
+        start_temp_janitor()
         
-        # 添加所有工作流
-        for workflow_id, workflow in workflows.items():
-            # 根据工作流ID判断类型
-            workflow_type = get_workflow_type(workflow)
+        # 选项卡结构按配置文件修改时间缓存在会话中，配置未变化时不再重新构建
+        config_key = _workflows_mtime()
+        tab_cfg = st.session_state.get("_tab_cfg")
+        if tab_cfg is None or tab_cfg["key"] != config_key:
+            # 加载工作流配置
+            workflows = load_workflows()
+            if not workflows:
+                st.error("加载工作流配置失败")
+                return
             
-            tab_names.append(workflow['name'])
-            tab_workflows.append((workflow_id, workflow, workflow_type))
+            # 工作流选项卡在前，图像识别选项卡在最后（工作流类型由 render_workflow_tab 自行判断）
+            tab_cfg = {
+                "key": config_key,
+                "names": [workflow['name'] for workflow in workflows.values()] + ["图像识别"],
+                "items": list(workflows.items()),
+            }
+            st.session_state["_tab_cfg"] = tab_cfg
         
-        # 添加图像识别选项卡
-        tab_names.append("图像识别")
+        tab_names = tab_cfg["names"]
+        tab_workflows = tab_cfg["items"]
         
         # 创建选项卡
         tabs = st.tabs(tab_names)
         
         # 渲染工作流选项卡
-        for i, (workflow_id, workflow, workflow_type) in enumerate(tab_workflows):
+        for i, (workflow_id, workflow) in enumerate(tab_workflows):
             with tabs[i]:
                 render_workflow_tab(workflow_id, workflow)
         
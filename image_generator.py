@@ -6,11 +6,23 @@ AI图像生成模块
 
 import os
 import io
+import asyncio
+import re
+import functools
+import hashlib
+import shelve
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import base64
 import time
+import uuid
 import random
 import requests
-from PIL import Image
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from PIL import Image, ImageEnhance, ImageStat
 from io import BytesIO
 from dotenv import load_dotenv
 import numpy as np
@@ -18,6 +30,9 @@ import numpy as np
 # 加载环境变量
 load_dotenv()
 
+# RunningHub 接口需要关闭 SSL 验证，屏蔽由此产生的警告
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
 # 创建图像存储目录
 GENERATED_IMAGES_DIR = "generated_images"
 os.makedirs(GENERATED_IMAGES_DIR, exist_ok=True)
@@ -31,6 +46,14 @@ RUNNINGHUB_API_KEY = os.getenv("RUNNINGHUB_API_KEY")  # RunningHub API密钥
 RUNNINGHUB_API_BASE = "https://www.runninghub.cn"  # RunningHub API基础URL
 RUNNINGHUB_WORKFLOW_ID = "1889944455695441922"  # RunningHub 工作流ID
 
+# 中文字符（不含中文字符的文本无需翻译）
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+
+# 翻译结果持久化缓存（标准库 shelve），相同提示词在重启后也无需再次调用翻译API
+TRANSLATION_CACHE_PATH = os.path.join(GENERATED_IMAGES_DIR, ".trans_cache")
+TRANSLATION_CACHE_TTL = 30 * 24 * 3600  # 30天
+_TRANSLATION_CACHE_LOCK = threading.Lock()
+
 # 翻译API选项
 TRANSLATION_APIS = {
     "baidu": "百度翻译",
@@ -61,6 +84,10 @@ IMAGE_STYLES = {
     "霓虹": {"name": "霓虹风格，明亮的发光效果", "preset": "neon"}
 }
 
+# 提示词清理时移除的敏感词（预编译为单个正则，一次扫描完成全部替换）
+_BANNED_BASIC = re.compile("|".join(map(re.escape, ["血腥", "暴力", "恐怖"])))
+_BANNED_STRICT = re.compile("|".join(map(re.escape, ["血腥", "暴力", "恐怖", "裸", "性", "死", "血"])))
+
 # 图像质量选项
 IMAGE_QUALITY = {
     "标准": {"width": 1024, "height": 1024, "steps": 30},
@@ -68,6 +95,90 @@ IMAGE_QUALITY = {
     "超清": {"width": 1536, "height": 640, "steps": 50}
 }
 
+# 常见颜色关键词映射
+_COLOR_KEYWORDS = {
+    "红": (200, 50, 50),
+    "绿": (50, 180, 50),
+    "蓝": (50, 100, 200),
+    "黄": (230, 200, 50),
+    "紫": (150, 50, 200),
+    "青": (50, 200, 200),
+    "橙": (230, 140, 30),
+    "粉": (230, 150, 180),
+    "棕": (140, 80, 20),
+    "灰": (130, 130, 130),
+    "黑": (30, 30, 30),
+    "白": (240, 240, 240),
+}
+_COLOR_RE = re.compile("|".join(map(re.escape, _COLOR_KEYWORDS)))
+
+# 风格相关的默认颜色
+_STYLE_COLORS = {
+    "写实": ((100, 100, 100), (150, 150, 150), (200, 200, 200)),
+    "油画": ((120, 80, 40), (40, 100, 160), (160, 160, 80)),
+    "水彩": ((200, 220, 255), (255, 200, 200), (200, 250, 200)),
+    "插画": ((255, 200, 100), (100, 200, 255), (200, 100, 255)),
+    "二次元": ((255, 170, 200), (170, 200, 255), (170, 255, 200)),
+    "像素艺术": ((100, 120, 200), (200, 100, 100), (100, 200, 100)),
+    "赛博朋克": ((0, 200, 255), (255, 0, 150), (150, 255, 0)),
+    "奇幻": ((100, 50, 200), (50, 200, 100), (200, 100, 50)),
+    "哥特": ((50, 0, 100), (100, 0, 50), (30, 30, 50)),
+    "印象派": ((200, 220, 100), (100, 200, 220), (220, 100, 200)),
+    "极简主义": ((240, 240, 240), (30, 30, 30), (200, 200, 200)),
+    "复古": ((200, 180, 140), (140, 120, 100), (180, 160, 120)),
+    "蒸汽朋克": ((180, 140, 100), (100, 80, 60), (140, 100, 60)),
+    "波普艺术": ((255, 50, 50), (50, 50, 255), (255, 255, 50)),
+    "超现实主义": ((100, 200, 255), (255, 100, 200), (200, 255, 100)),
+}
+_DEFAULT_COLORS = ((100, 100, 100), (200, 200, 200), (150, 150, 150))
+
+@functools.lru_cache(maxsize=1024)
+def _colors_for_prompt(prompt, style):
+    """
+    从提示词和风格中提取颜色（按参数缓存）
+    
+    参数:
+        prompt (str): 提示词
+        style (str): 风格
+        
+    返回:
+        tuple: 颜色元组
+    """
+    # 从风格获取基础颜色
+    base_colors = _STYLE_COLORS.get(style, _DEFAULT_COLORS) if style else _DEFAULT_COLORS
+    
+    # 一次正则扫描找出提示词中的颜色关键词，按关键词表的顺序输出
+    found = set(_COLOR_RE.findall(prompt)) if prompt else ()
+    detected_colors = tuple(color for keyword, color in _COLOR_KEYWORDS.items() if keyword in found)
+    
+    # 组合颜色
+    return base_colors + detected_colors
+
+# 新颜色按 0.3 权重叠加到现有颜色上的混合表：_BLEND_LUT[现有值, 新值]
+_BLEND_LUT = (
+    np.arange(256, dtype=np.float32)[:, None] * np.float32(0.7)
+    + np.arange(256, dtype=np.float32)[None, :] * np.float32(0.3)
+).astype(np.uint8)
+
+@functools.lru_cache(maxsize=8)
+def _coordinate_grid(height, width):
+    """
+    获取图像的行、列坐标（float32，形状分别为 (height, 1) 和 (1, width)，可广播），按尺寸缓存
+    
+    参数:
+        height (int): 图像高度
+        width (int): 图像宽度
+        
+    返回:
+        tuple: (行坐标, 列坐标)，均为只读数组
+    """
+    ys, xs = np.ogrid[:height, :width]
+    ys = ys.astype(np.float32)
+    xs = xs.astype(np.float32)
+    ys.setflags(write=False)
+    xs.setflags(write=False)
+    return ys, xs
+
 class ImageGenerator:
     """图像生成类"""
     
@@ -98,6 +209,61 @@ class ImageGenerator:
             print("警告: 未提供百度翻译API密钥，将使用模拟翻译模式")
         elif self.translation_api == "dashscope" and not self.dashscope_api_key:
             print("警告: 未提供通义千问API密钥，将使用模拟翻译模式")
+        
+        # 所有API调用共享一个会话，复用连接池和 keep-alive 连接；
+        # 限流和服务端临时错误由连接池按指数退避自动重试，重试用尽后才回退到模拟生成
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["POST", "GET"],
+                raise_on_status=False
+            )
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # 提交生成任务的接口不是幂等的：5xx 或读取超时时任务可能已被接受，重试会重复生成并计费。
+        # 这些接口只重试连接失败（请求未发出）和限流（429，请求被拒绝）；
+        # requests 按最长前缀匹配适配器，因此下面的挂载优先于上面的通用适配器
+        create_adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                other=0,
+                status=3,
+                backoff_factor=0.5,
+                status_forcelist=[429],
+                allowed_methods=["POST"],
+                raise_on_status=False
+            )
+        )
+        self._session.mount(STABILITY_API_BASE, create_adapter)
+        self._session.mount(f"{RUNNINGHUB_API_BASE}/task/openapi/create", create_adapter)
+        
+        # 阻塞的网络请求和图像处理在有界线程池中执行，供异步和批量接口使用；
+        # 线程池在首次使用时才创建，由 close()、with 语句或实例回收时关闭
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __del__(self):
+        # 未调用 close() 的实例被回收时关闭线程池，避免空闲工作线程一直存在
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
             
     def generate_from_text(self, prompt, style=None, quality="标准", negative_prompt=None, seed=None, use_mock=False):
         """
@@ -247,7 +413,7 @@ class ImageGenerator:
                     prompt["text"] = self._sanitize_prompt(prompt["text"])
             
             # 发送请求
-            response = requests.post(
+            response = self._session.post(
                 f"{STABILITY_API_BASE}/{endpoint}",
                 headers=headers,
                 json=payload,
@@ -293,13 +459,11 @@ class ImageGenerator:
         返回:
             str: 清理后的提示词
         """
-        # 基础清理
-        cleaned = prompt.replace("血腥", "").replace("暴力", "").replace("恐怖", "")
-        
-        if strict:
-            # 严格模式下的额外清理
-            cleaned = cleaned.replace("裸", "").replace("性", "").replace("死", "")
-            cleaned = cleaned.replace("恐怖", "").replace("血", "").replace("暴力", "")
+        pattern = _BANNED_STRICT if strict else _BANNED_BASIC
+        cleaned, count = pattern.subn("", prompt)
+        # 移除后相邻字符可能拼成新的敏感词，直到没有匹配为止
+        while count:
+            cleaned, count = pattern.subn("", cleaned)
             
         return cleaned.strip()
     
@@ -316,9 +480,8 @@ class ImageGenerator:
         返回:
             str: 生成的图像文件路径
         """
-        # 设置随机种子以保证可重复性
-        random.seed(seed)
-        np.random.seed(seed)
+        # 使用以种子初始化的独立随机数生成器，每个分支一次性批量抽取所需的随机数
+        rng = np.random.default_rng(seed)
         
         # 创建一个随机颜色的基础图像
         width = quality_params["width"]
@@ -327,63 +490,70 @@ class ImageGenerator:
         # 根据提示词和风格确定主色调
         # 这只是一个简单的演示，实际上不同提示词应有不同的视觉效果
         colors = self._get_colors_from_prompt(prompt, style)
+        palette = np.asarray(colors, dtype=np.uint8)
         
-        # 创建图像
-        img_array = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        # 根据风格选择不同的生成方式
+        # 根据风格选择不同的生成方式（各分支自行创建图像数组）
         if style in ["像素艺术", "二次元", "极简主义"]:
             # 创建方块图案
             block_size = max(4, width // 64)
-            for y in range(0, height, block_size):
-                for x in range(0, width, block_size):
-                    color = random.choice(colors)
-                    img_array[y:min(y+block_size, height), x:min(x+block_size, width)] = color
+            rows = -(-height // block_size)
+            cols = -(-width // block_size)
+            # 一次抽取所有方块的颜色，再将方块颜色网格整体放大到像素尺寸，避免逐块切片赋值
+            blocks = palette[rng.integers(0, len(colors), size=(rows, cols))]
+            img_array = np.ascontiguousarray(
+                np.repeat(np.repeat(blocks, block_size, axis=0), block_size, axis=1)[:height, :width]
+            )
         
         elif style in ["水彩", "油画", "印象派"]:
             # 创建渐变和笔触效果
-            for _ in range(100):
-                # 随机形状
-                center_x = np.random.randint(0, width)
-                center_y = np.random.randint(0, height)
-                size = np.random.randint(width//20, width//4)
-                color = random.choice(colors)
-                
+            # 一次抽取全部100个圆形的位置、大小和颜色
+            num_stamps = 100
+            centers_x = rng.integers(0, width, size=num_stamps)
+            centers_y = rng.integers(0, height, size=num_stamps)
+            sizes = rng.integers(width//20, width//4, size=num_stamps)
+            stamp_colors = palette[rng.integers(0, len(colors), size=num_stamps)]
+            
+            # 圆形之间可能留有空隙，用风格主色作为底色而不是纯黑
+            img_array = np.full((height, width, 3), palette[0], dtype=np.uint8)
+            
+            # 坐标网格按尺寸缓存，每个圆形只在其外接矩形范围内计算
+            ys, xs = _coordinate_grid(height, width)
+            for center_x, center_y, size, color in zip(centers_x, centers_y, sizes, stamp_colors):
                 # 画一个柔和的圆形区域
-                y, x = np.ogrid[-center_y:height-center_y, -center_x:width-center_x]
-                mask = x*x + y*y <= size*size
-                img_array[mask] = color
+                y0, y1 = max(0, center_y - size), min(height, center_y + size + 1)
+                x0, x1 = max(0, center_x - size), min(width, center_x + size + 1)
+                dy = ys[y0:y1] - center_y
+                dx = xs[:, x0:x1] - center_x
+                mask = dx*dx + dy*dy <= size*size
+                img_array[y0:y1, x0:x1][mask] = color
         
         else:
             # 默认：创建抽象渐变
-            for _ in range(20):
-                # 随机渐变
-                start_x = np.random.randint(0, width)
-                start_y = np.random.randint(0, height)
-                end_x = np.random.randint(0, width)
-                end_y = np.random.randint(0, height)
+            # 一次抽取全部20组渐变的起点、终点和两端颜色
+            num_gradients = 20
+            endpoints = rng.integers(0, (width, height, width, height), size=(num_gradients, 4))
+            gradient_colors = palette[rng.integers(0, len(colors), size=(num_gradients, 2))].astype(np.float32)
+            
+            # 渐变从黑色底图开始逐层混合
+            img_array = np.zeros((height, width, 3), dtype=np.uint8)
+            
+            # 坐标网格按尺寸缓存并通过广播参与计算，全部使用 float32 以减少内存带宽
+            ys, xs = _coordinate_grid(height, width)
+            levels = np.arange(256, dtype=np.float32)[:, None] / 255
+            for (start_x, start_y, end_x, end_y), (color1, color2) in zip(endpoints, gradient_colors):
+                # 计算每个像素到起点和终点的距离比例，量化为 0-255 的等级
+                d1 = np.hypot(xs - start_x, ys - start_y)
+                d2 = np.hypot(xs - end_x, ys - end_y)
+                total = d1 + d2
+                ratio = np.divide(d1, total, out=np.zeros_like(d1), where=total > 0)
+                ratio_index = (ratio * 255 + 0.5).astype(np.uint8)
                 
-                color1 = random.choice(colors)
-                color2 = random.choice(colors)
-                
-                # 创建渐变
-                for y in range(height):
-                    for x in range(width):
-                        # 计算当前点到起点和终点的距离比例
-                        d1 = np.sqrt((x - start_x)**2 + (y - start_y)**2)
-                        d2 = np.sqrt((x - end_x)**2 + (y - end_y)**2)
-                        
-                        # 混合颜色
-                        if d1 + d2 > 0:
-                            ratio = d1 / (d1 + d2)
-                            color = (
-                                int(color1[0] * (1 - ratio) + color2[0] * ratio),
-                                int(color1[1] * (1 - ratio) + color2[1] * ratio),
-                                int(color1[2] * (1 - ratio) + color2[2] * ratio)
-                            )
-                            
-                            # 与现有颜色混合
-                            img_array[y, x] = (img_array[y, x] * 0.7 + np.array(color) * 0.3).astype(np.uint8)
+                # 两端颜色在256个等级上的混合结果预先算成查找表，逐像素只需查表；
+                # 再通过预计算的 0.7/0.3 混合表与现有颜色混合，全程为 uint8 运算
+                gradient_lut = np.floor(color1 * (1 - levels) + color2 * levels).astype(np.uint8)
+                color = gradient_lut[ratio_index]
+                blended = _BLEND_LUT[img_array, color]
+                np.copyto(img_array, blended, where=(total > 0)[..., None])
         
         # 转换为PIL图像
         img = Image.fromarray(img_array)
@@ -423,33 +593,40 @@ class ImageGenerator:
                 else:
                     new_height = max_size
                     new_width = int(width * (max_size / height))
-                original_img = original_img.resize((new_width, new_height), Image.LANCZOS)
+                # reducing_gap 先用整数倍快速缩小再做 LANCZOS 重采样，大幅缩小时明显更快
+                original_img = original_img.resize((new_width, new_height), Image.LANCZOS, reducing_gap=3.0)
             
-            # 转换为numpy数组
-            img_array = np.array(original_img)
+            # 转换为numpy数组（只读视图即可，噪声叠加写入单独的缓冲区，无需再复制一份像素）
+            img_array = np.asarray(original_img)
             
             # 添加随机变化
+            # 在 int16 噪声数组上原地完成叠加和截断，避免额外的整图临时数组
             noise = np.random.normal(0, 30 * variation_strength, img_array.shape).astype(np.int16)
-            varied_array = np.clip(img_array.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+            np.add(noise, img_array, out=noise)
+            np.clip(noise, 0, 255, out=noise)
+            varied_array = noise.astype(np.uint8)
             
             # 调整颜色和对比度
             varied_img = Image.fromarray(varied_array)
             
             # 随机调整亮度、对比度和饱和度
-            from PIL import ImageEnhance
-            
-            enhancer = ImageEnhance.Brightness(varied_img)
-            varied_img = enhancer.enhance(random.uniform(0.8, 1.2))
+            brightness = random.uniform(0.8, 1.2)
+            contrast = random.uniform(0.9, 1.3)
             
-            enhancer = ImageEnhance.Contrast(varied_img)
-            varied_img = enhancer.enhance(random.uniform(0.9, 1.3))
+            # 亮度和对比度都是逐像素值的映射，合并为一张查找表一次完成；
+            # 对比度以调整亮度后的灰度均值为中心（与 ImageEnhance.Contrast 一致）
+            gray_mean = min(255.0, ImageStat.Stat(varied_img.convert("L")).mean[0] * brightness)
+            gray_mean = int(gray_mean + 0.5)
+            levels = np.clip(np.arange(256) * brightness, 0, 255)
+            lut = np.clip(gray_mean + (levels - gray_mean) * contrast + 0.5, 0, 255).astype(np.uint8)
+            varied_img = varied_img.point(lut.tolist() * len(varied_img.getbands()))
             
             enhancer = ImageEnhance.Color(varied_img)
             varied_img = enhancer.enhance(random.uniform(0.9, 1.4))
             
-            # 保存结果
+            # 保存结果（文件名带随机后缀，同一秒内对同一图片生成的多个变体不会互相覆盖）
             timestamp = int(time.time())
-            output_path = os.path.join(GENERATED_IMAGES_DIR, f"var_{timestamp}_{os.path.basename(image_path)}")
+            output_path = os.path.join(GENERATED_IMAGES_DIR, f"var_{timestamp}_{uuid.uuid4().hex[:8]}_{os.path.basename(image_path)}")
             varied_img.save(output_path)
             
             return output_path
@@ -470,57 +647,7 @@ class ImageGenerator:
         返回:
             list: 颜色列表
         """
-        # 常见颜色关键词映射
-        color_keywords = {
-            "红": [200, 50, 50],
-            "绿": [50, 180, 50],
-            "蓝": [50, 100, 200],
-            "黄": [230, 200, 50],
-            "紫": [150, 50, 200],
-            "青": [50, 200, 200],
-            "橙": [230, 140, 30],
-            "粉": [230, 150, 180],
-            "棕": [140, 80, 20],
-            "灰": [130, 130, 130],
-            "黑": [30, 30, 30],
-            "白": [240, 240, 240],
-        }
-        
-        # 风格相关的默认颜色
-        style_colors = {
-            "写实": [[100, 100, 100], [150, 150, 150], [200, 200, 200]],
-            "油画": [[120, 80, 40], [40, 100, 160], [160, 160, 80]],
-            "水彩": [[200, 220, 255], [255, 200, 200], [200, 250, 200]],
-            "插画": [[255, 200, 100], [100, 200, 255], [200, 100, 255]],
-            "二次元": [[255, 170, 200], [170, 200, 255], [170, 255, 200]],
-            "像素艺术": [[100, 120, 200], [200, 100, 100], [100, 200, 100]],
-            "赛博朋克": [[0, 200, 255], [255, 0, 150], [150, 255, 0]],
-            "奇幻": [[100, 50, 200], [50, 200, 100], [200, 100, 50]],
-            "哥特": [[50, 0, 100], [100, 0, 50], [30, 30, 50]],
-            "印象派": [[200, 220, 100], [100, 200, 220], [220, 100, 200]],
-            "极简主义": [[240, 240, 240], [30, 30, 30], [200, 200, 200]],
-            "复古": [[200, 180, 140], [140, 120, 100], [180, 160, 120]],
-            "蒸汽朋克": [[180, 140, 100], [100, 80, 60], [140, 100, 60]],
-            "波普艺术": [[255, 50, 50], [50, 50, 255], [255, 255, 50]],
-            "超现实主义": [[100, 200, 255], [255, 100, 200], [200, 255, 100]]
-        }
-        
-        # 从风格获取基础颜色
-        if not style or style not in style_colors:
-            base_colors = [[100, 100, 100], [200, 200, 200], [150, 150, 150]]
-        else:
-            base_colors = style_colors.get(style)
-        
-        # 从提示词中查找颜色关键词
-        detected_colors = []
-        if prompt:
-            for keyword, color in color_keywords.items():
-                if keyword in prompt:
-                    detected_colors.append(color)
-        
-        # 组合颜色
-        colors = base_colors + detected_colors if detected_colors else base_colors
-        return colors
+        return list(_colors_for_prompt(prompt, style))
     
     def _translate_text(self, text, from_lang="zh", to_lang="en"):
         """
@@ -536,10 +663,20 @@ class ImageGenerator:
         """
         if not text:
             return ""
+        
+        # 英文或不含中文字符的文本直接返回，无需调用翻译API
+        if text.isascii() or not _CJK_RE.search(text):
+            return text
             
         if not self.dashscope_api_key:
             print("警告: 未提供通义千问API密钥，将使用模拟翻译模式")
             return f"[原文: {text}]"
+        
+        # 优先使用缓存的翻译结果
+        cache_key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        cached = self._get_cached_translation(cache_key)
+        if cached is not None:
+            return cached
             
         try:
             # 构建翻译提示词
@@ -565,7 +702,7 @@ class ImageGenerator:
             }
             
             # 发送请求
-            response = requests.post(
+            response = self._session.post(
                 DASHSCOPE_API_BASE,
                 headers=headers,
                 json=payload,
@@ -576,7 +713,9 @@ class ImageGenerator:
             if response.status_code == 200:
                 result = response.json()
                 if "output" in result and "text" in result["output"]:
-                    return result["output"]["text"].strip()
+                    translated = result["output"]["text"].strip()
+                    self._set_cached_translation(cache_key, translated)
+                    return translated
             
             print(f"翻译API调用失败: {response.status_code} - {response.text}")
             return f"[原文: {text}]"
@@ -585,6 +724,44 @@ class ImageGenerator:
             print(f"翻译过程中出错: {str(e)}")
             return f"[原文: {text}]"
 
+    def _get_cached_translation(self, key):
+        """
+        读取缓存的翻译结果
+        
+        参数:
+            key (str): 原文的哈希值
+            
+        返回:
+            str: 未过期的翻译结果，不存在或已过期时返回None
+        """
+        try:
+            with _TRANSLATION_CACHE_LOCK, shelve.open(TRANSLATION_CACHE_PATH) as cache:
+                entry = cache.get(key)
+        except Exception as e:
+            print(f"读取翻译缓存失败: {str(e)}")
+            return None
+        
+        if entry is None:
+            return None
+        saved_at, translated = entry
+        if time.time() - saved_at > TRANSLATION_CACHE_TTL:
+            return None
+        return translated
+    
+    def _set_cached_translation(self, key, translated):
+        """
+        保存翻译结果到缓存
+        
+        参数:
+            key (str): 原文的哈希值
+            translated (str): 翻译结果
+        """
+        try:
+            with _TRANSLATION_CACHE_LOCK, shelve.open(TRANSLATION_CACHE_PATH) as cache:
+                cache[key] = (time.time(), translated)
+        except Exception as e:
+            print(f"写入翻译缓存失败: {str(e)}")
+
     def _check_task_status(self, task_id):
         """
         检查RunningHub任务状态
@@ -608,16 +785,13 @@ class ImageGenerator:
                 "Host": "www.runninghub.cn"
             }
             
-            # 创建Session对象以自定义SSL验证
-            session = requests.Session()
-            session.verify = False  # 禁用SSL证书验证
-            
             # 发送请求
-            response = session.post(
+            response = self._session.post(
                 f"{RUNNINGHUB_API_BASE}/task/openapi/status",
                 headers=headers,
                 json=payload,
-                timeout=30
+                timeout=30,
+                verify=False  # 禁用SSL证书验证
             )
             
             if response.status_code == 200:
@@ -657,16 +831,13 @@ class ImageGenerator:
                 "Connection": "keep-alive"
             }
             
-            # 创建Session对象以自定义SSL验证
-            session = requests.Session()
-            session.verify = False  # 禁用SSL证书验证
-            
             # 发送请求
-            response = session.post(
+            response = self._session.post(
                 f"{RUNNINGHUB_API_BASE}/task/openapi/outputs",
                 headers=headers,
                 json=payload,
-                timeout=30
+                timeout=30,
+                verify=False  # 禁用SSL证书验证
             )
             
             if response.status_code == 200:
@@ -692,20 +863,16 @@ class ImageGenerator:
             bool: 下载是否成功
         """
         try:
-            # 创建Session对象以自定义SSL验证
-            session = requests.Session()
-            session.verify = False  # 禁用SSL证书验证
-            
-            # 下载图像
-            response = session.get(url, timeout=30)
-            
-            if response.status_code == 200:
-                # 保存图像
+            # 下载图像，以流式方式边接收边写入文件，不在内存中缓存完整内容
+            with self._session.get(url, timeout=30, stream=True, verify=False) as response:  # 禁用SSL证书验证
+                if response.status_code != 200:
+                    return False
+                
+                # 保存图像（服务器启用压缩时自动解压）
+                response.raw.decode_content = True
                 with open(output_path, "wb") as f:
-                    f.write(response.content)
-                return True
-            
-            return False
+                    shutil.copyfileobj(response.raw, f, length=64 * 1024)
+            return True
             
         except Exception as e:
             print(f"下载图像失败: {str(e)}")
@@ -766,17 +933,14 @@ class ImageGenerator:
                 "Connection": "keep-alive"
             }
             
-            # 创建Session对象以自定义SSL验证
-            session = requests.Session()
-            session.verify = False  # 禁用SSL证书验证
-            
             # 发送请求
             print(f"发送请求到RunningHub API: {RUNNINGHUB_API_BASE}/task/openapi/create")
-            response = session.post(
+            response = self._session.post(
                 f"{RUNNINGHUB_API_BASE}/task/openapi/create",
                 headers=headers,
                 json=payload,
-                timeout=60  # 增加超时时间
+                timeout=60,  # 增加超时时间
+                verify=False  # 禁用SSL证书验证
             )
             
             # 打印响应状态码和响应内容以便调试
@@ -793,11 +957,11 @@ class ImageGenerator:
                     
                     print(f"任务创建成功，任务ID: {task_id}, 状态: {task_status}")
                     
-                    # 轮询任务状态
-                    max_retries = 30  # 最大重试次数
-                    retry_interval = 2  # 重试间隔（秒）
+                    # 轮询任务状态：间隔从0.25秒开始按1.5倍递增（最长4秒），总等待不超过120秒
+                    deadline = time.monotonic() + 120
+                    retry_interval = 0.25
                     
-                    for _ in range(max_retries):
+                    while time.monotonic() < deadline:
                         status = self._check_task_status(task_id)
                         print(f"当前任务状态: {status}")
                         
@@ -829,6 +993,7 @@ class ImageGenerator:
                             break
                         elif status == "RUNNING":
                             time.sleep(retry_interval)
+                            retry_interval = min(retry_interval * 1.5, 4.0)
                             continue
                         else:
                             print(f"未知任务状态: {status}")
@@ -847,6 +1012,89 @@ class ImageGenerator:
             print(f"RunningHub API调用失败: {str(e)}")
             return self._mock_generate_image(prompt, style, IMAGE_QUALITY[quality], seed)
     
+    async def generate_image_runninghub_async(self, prompt, style=None, quality="标准",
+                                              negative_prompt=None, seed=None, use_mock=False):
+        """
+        generate_image_runninghub 的异步版本，在工作线程中执行提交和轮询，
+        调用方可以用 asyncio.gather 同时发起多个生成任务
+        
+        参数:
+            与 generate_image_runninghub 相同
+            
+        返回:
+            str: 生成的图像文件路径
+        """
+        return await self._run_in_pool(
+            self.generate_image_runninghub,
+            prompt, style, quality, negative_prompt, seed, use_mock
+        )
+    
+    def generate_from_text_batch(self, prompts, style=None, quality="标准", negative_prompt=None, seed=None, use_mock=False):
+        """
+        批量根据文本提示生成图像，多个请求在线程池中并发执行
+        
+        参数:
+            prompts (list): 图像描述文本列表
+            seed (int, optional): 起始随机种子，第 i 个提示词使用 seed + i，
+                保证每个结果可复现且输出文件名互不相同
+            其余参数与 generate_from_text 相同，对所有提示词生效
+            
+        返回:
+            list: 与 prompts 顺序对应的图像文件路径列表
+        """
+        # 输出文件名由时间戳和种子组成，同一秒内完成的任务若共用种子会写入同一个文件
+        seeds = [None if seed is None else (seed + i) % 2**32 for i in range(len(prompts))]
+        return list(self._get_pool().map(
+            lambda prompt, item_seed: self.generate_from_text(prompt, style, quality, negative_prompt, item_seed, use_mock),
+            prompts,
+            seeds
+        ))
+    
+    async def generate_from_text_async(self, *args, **kwargs):
+        """
+        generate_from_text 的异步版本，在线程池中执行
+        
+        参数:
+            与 generate_from_text 相同
+            
+        返回:
+            str: 生成的图像文件路径
+        """
+        return await self._run_in_pool(self.generate_from_text, *args, **kwargs)
+    
+    async def _run_in_pool(self, func, *args, **kwargs):
+        """
+        在实例的线程池中执行阻塞函数
+        
+        参数:
+            func (callable): 要执行的函数
+            
+        返回:
+            函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), functools.partial(func, *args, **kwargs))
+    
+    def _get_pool(self):
+        """
+        获取实例的线程池，首次调用时创建
+        
+        返回:
+            ThreadPoolExecutor: 线程池
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="image-gen")
+            return self._pool
+    
+    def close(self):
+        """释放线程池和HTTP会话"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        self._session.close()
+    
     def generate_image(self, prompt, style=None, quality="标准", 
                       negative_prompt=None, seed=None, use_mock=False, api="stability"):
         """
@@ -10,7 +10,9 @@ import requests
 from dotenv import load_dotenv
 from PIL import Image
 import io
+import re
 import json
+import reprlib
 
 # 加载环境变量
 load_dotenv()
@@ -30,6 +32,27 @@ TASK_TYPES = {
     "科普": "请根据这张图片进行详细的科普解释，介绍相关的科学知识。"
 }
 
+# 无法解析的响应只输出截断后的摘要，避免完整序列化体积很大的响应
+_RESPONSE_REPR = reprlib.Repr()
+_RESPONSE_REPR.maxlevel = 4
+_RESPONSE_REPR.maxdict = 10
+_RESPONSE_REPR.maxlist = 10
+_RESPONSE_REPR.maxstring = 200
+_RESPONSE_REPR.maxother = 200
+
+def _summarize_response(response_data, limit=1000):
+    """
+    生成响应数据的截断摘要（用于调试输出）
+    
+    参数:
+        response_data: 响应数据
+        limit: int, 摘要最大长度
+        
+    返回:
+        str: 截断后的摘要
+    """
+    return _RESPONSE_REPR.repr(response_data)[:limit]
+
 class QwenAPI:
     def __init__(self, api_key=None):
         """
@@ -179,7 +202,7 @@ class QwenAPI:
                 return response["text"]
                 
             # 返回原始响应（用于调试）
-            return f"无法解析响应格式: {json.dumps(response, ensure_ascii=False)}"
+            return f"无法解析响应格式: {_summarize_response(response)}"
         except Exception as e:
             return f"解析响应时出错: {str(e)}"
     
@@ -304,7 +327,6 @@ def analyze_description(description):
     for keyword in food_keywords:
         if keyword in description:
             # 尝试提取食物名称
-            import re
             food_matches = re.findall(r'(?:是|像|为|叫)([^，。,\.]+?)(?:，|。|,|\.|$)', description)
             if food_matches:
                 for match in food_matches:
@@ -318,7 +340,6 @@ def analyze_description(description):
     for keyword in product_keywords:
         if keyword in description:
             # 尝试提取商品名称
-            import re
             product_matches = re.findall(r'(?:是|像|为|叫)([^，。,\.]+?)(?:，|。|,|\.|$)', description)
             if product_matches:
                 for match in product_matches:
@@ -401,6 +422,6 @@ def parse_qwen_response(response_data):
                                 return content[0]["text"]
         
         # 返回原始响应（用于调试）
-        return f"无法解析响应格式: {json.dumps(response_data, ensure_ascii=False)}"
+        return f"无法解析响应格式: {_summarize_response(response_data)}"
     except Exception as e:
         return f"解析响应时出错: {str(e)}" 
\ No newline at end of file
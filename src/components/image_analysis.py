@@ -3,8 +3,25 @@
 """
 
 import streamlit as st
-from PIL import Image
-import io
+
+# 右侧说明栏的静态内容，导入时创建一次，避免每次重新运行时重建
+_USAGE_MD = """
+1. 上传一张想要分析的图片
+2. 选择分析类型
+3. 可以输入自定义提示词来引导分析
+4. 点击"开始分析"按钮
+"""
+
+_ANALYSIS_TYPES_MD = """
+- **图像描述**：生成对图像内容的详细描述
+- **场景分析**：分析图像中的场景、环境和氛围
+- **物体识别**：识别并列出图像中的主要物体
+- **文字提取**：提取图像中的文字内容
+- **问题解答**：基于图像回答相关问题
+- **故事创作**：根据图像创作有趣的故事
+- **诗歌创作**：将图像内容转化为诗歌形式
+- **科普讲解**：对图像内容进行科普解释
+"""
 
 def render_image_analysis():
     """渲染图像分析界面"""
@@ -22,38 +39,36 @@ def render_image_analysis():
         )
         
         if uploaded_file:
-            # 显示上传的图片
-            image = Image.open(uploaded_file)
-            st.image(image, caption="上传的图片", use_column_width=True)
+            # 显示上传的图片（直接传入上传文件，无需经 PIL 解码）
+            st.image(uploaded_file, caption="上传的图片", use_column_width=True)
             
-            # 将图片转换为字节流，以便后续处理
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format=image.format)
-            img_byte_arr = img_byte_arr.getvalue()
+            # 分析选项放在表单中，输入提示词时不触发重新运行，点击"开始分析"时一次性提交
+            with st.form("analysis_form"):
+                # 分析类型选择
+                analysis_type = st.selectbox(
+                    "选择分析类型",
+                    options=[
+                        "图像描述",
+                        "场景分析",
+                        "物体识别",
+                        "文字提取",
+                        "问题解答",
+                        "故事创作",
+                        "诗歌创作",
+                        "科普讲解"
+                    ]
+                )
+                
+                # 自定义提示词
+                custom_prompt = st.text_area(
+                    "自定义提示词（可选）",
+                    help="您可以输入特定的提示词来引导AI的分析方向"
+                )
+                
+                # 分析按钮
+                submitted = st.form_submit_button("开始分析", type="primary")
             
-            # 分析类型选择
-            analysis_type = st.selectbox(
-                "选择分析类型",
-                options=[
-                    "图像描述",
-                    "场景分析",
-                    "物体识别",
-                    "文字提取",
-                    "问题解答",
-                    "故事创作",
-                    "诗歌创作",
-                    "科普讲解"
-                ]
-            )
-            
-            # 自定义提示词
-            custom_prompt = st.text_area(
-                "自定义提示词（可选）",
-                help="您可以输入特定的提示词来引导AI的分析方向"
-            )
-            
-            # 分析按钮
-            if st.button("开始分析", type="primary"):
+            if submitted:
                 with st.spinner("正在分析图片..."):
                     try:
                         # TODO: 调用图像分析服务
@@ -64,22 +79,10 @@ def render_image_analysis():
                         st.error(f"分析过程中发生错误: {str(e)}")
     
     with col2:
-        st.markdown("### 使用说明")
-        st.write("""
-        1. 上传一张想要分析的图片
-        2. 选择分析类型
-        3. 可以输入自定义提示词来引导分析
-        4. 点击"开始分析"按钮
-        """)
-        
-        st.markdown("### 分析类型说明")
-        st.write("""
-        - **图像描述**：生成对图像内容的详细描述
-        - **场景分析**：分析图像中的场景、环境和氛围
-        - **物体识别**：识别并列出图像中的主要物体
-        - **文字提取**：提取图像中的文字内容
-        - **问题解答**：基于图像回答相关问题
-        - **故事创作**：根据图像创作有趣的故事
-        - **诗歌创作**：将图像内容转化为诗歌形式
-        - **科普讲解**：对图像内容进行科普解释
-        """) 
\ No newline at end of file
+        # 说明内容只在用户勾选时渲染，避免每次重新运行都发送到前端
+        if st.checkbox("显示使用说明", key="show_help"):
+            st.markdown("### 使用说明")
+            st.write(_USAGE_MD)
+            
+            st.markdown("### 分析类型说明")
+            st.write(_ANALYSIS_TYPES_MD)
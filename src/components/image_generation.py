@@ -4,7 +4,7 @@
 
 import streamlit as st
 from src.components.workflow_manager import get_workflow_selector
-from src.services.image_generator import generate_image_runninghub
+from src.services.image_generator import generate_image_runninghub, generate_images_runninghub
 
 def render_image_generation():
     """渲染图像生成界面"""
@@ -20,28 +20,36 @@ def render_image_generation():
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # 提示词输入
-        prompt = st.text_area(
-            "正向提示词",
-            height=120,
-            help="描述你想要生成的图像内容"
-        )
-        
-        negative_prompt = st.text_area(
-            "反向提示词（可选）",
-            height=80,
-            help="描述你不想在生成的图像中出现的内容"
-        )
-        
-        # 高级选项
-        with st.expander("高级选项"):
-            seed = st.number_input(
-                "随机种子",
-                min_value=-1,
-                max_value=2**32-1,
-                value=-1,
-                help="设置-1为随机种子"
+        # 输入控件放在表单中，输入过程中不触发重新运行，点击生成时一次性提交
+        with st.form("gen_form"):
+            # 批量模式下每行一个提示词，所有提示词并发生成
+            batch_mode = st.checkbox("批量模式（每行一个提示词）")
+            
+            # 提示词输入
+            prompt = st.text_area(
+                "正向提示词",
+                height=120,
+                help="描述你想要生成的图像内容"
             )
+            
+            negative_prompt = st.text_area(
+                "反向提示词（可选）",
+                height=80,
+                help="描述你不想在生成的图像中出现的内容"
+            )
+            
+            # 高级选项
+            with st.expander("高级选项"):
+                seed = st.number_input(
+                    "随机种子",
+                    min_value=-1,
+                    max_value=2**32-1,
+                    value=-1,
+                    help="设置-1为随机种子"
+                )
+            
+            # 生成按钮
+            submitted = st.form_submit_button("生成图像", type="primary")
     
     with col2:
         # 显示工作流信息
@@ -54,20 +62,41 @@ def render_image_generation():
             st.write("**参数:**")
             st.json(workflow_info['parameters'])
         
-        # 生成按钮
-        if st.button("生成图像", type="primary", disabled=not prompt):
+        # 提交后生成
+        if submitted:
             if not prompt:
                 st.error("请输入正向提示词")
                 return
                 
             try:
                 with st.spinner("正在生成图像..."):
+                    if batch_mode:
+                        prompts = [line.strip() for line in prompt.splitlines() if line.strip()]
+                        results = generate_images_runninghub(
+                            prompts=prompts,
+                            negative_prompt=negative_prompt if negative_prompt else None,
+                            seed=seed if seed >= 0 else None,
+                            workflow_id=workflow_id,
+                            workflow_config=workflow_info
+                        )
+                        
+                        succeeded = [r for r in results if r and r.get("image_path")]
+                        if succeeded:
+                            st.success(f"图像生成完成：成功 {len(succeeded)}/{len(prompts)} 张")
+                            for item_prompt, result in zip(prompts, results):
+                                if result and result.get("image_path"):
+                                    st.image(result["image_path"], caption=item_prompt)
+                        else:
+                            st.error("图像生成失败")
+                        return
+                    
                     # 调用图像生成服务
                     result = generate_image_runninghub(
                         prompt=prompt,
                         negative_prompt=negative_prompt if negative_prompt else None,
                         seed=seed if seed >= 0 else None,
-                        workflow_id=workflow_id
+                        workflow_id=workflow_id,
+                        workflow_config=workflow_info
                     )
                     
                     if result and result.get("image_path"):
@@ -76,4 +105,4 @@ def render_image_generation():
                     else:
                         st.error("图像生成失败")
             except Exception as e:
-                st.error(f"生成过程中发生错误: {str(e)}") 
\ No newline at end of file
+                st.error(f"生成过程中发生错误: {str(e)}")
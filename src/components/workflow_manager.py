@@ -2,9 +2,62 @@
 工作流管理组件模块
 """
 
+import os
+import json
+import threading
 import streamlit as st
 from src.utils.workflow_config import WorkflowConfig
 
+# 工作流配置文件
+WORKFLOWS_FILE = "workflows.json"
+
+# 配置实例在所有会话之间共享，增删工作流时加锁，避免并发修改同一个字典和配置文件
+_CONFIG_LOCK = threading.Lock()
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _cached_workflow_config(config_mtime):
+    """
+    按配置文件修改时间缓存工作流配置实例
+    
+    参数:
+        config_mtime: int, 配置文件的修改时间（纳秒），文件不存在时为 None
+        
+    返回:
+        WorkflowConfig: 工作流配置
+    """
+    return WorkflowConfig(WORKFLOWS_FILE)
+
+def _get_workflow_config():
+    """
+    获取工作流配置实例，在多次重新运行之间复用，避免每次都重新读取和解析配置文件；
+    配置文件被修改（包括在应用外部编辑）后自动重新加载
+    
+    返回:
+        WorkflowConfig: 工作流配置
+    """
+    try:
+        config_mtime = os.stat(WORKFLOWS_FILE).st_mtime_ns
+    except OSError:
+        config_mtime = None
+    return _cached_workflow_config(config_mtime)
+
+def _update_workflows(update):
+    """
+    在锁内对最新的配置实例执行修改，避免覆盖其他会话刚保存的修改；
+    保存失败时丢弃缓存的实例，下次从配置文件重新加载
+    
+    参数:
+        update (callable): 接收 WorkflowConfig 并返回是否保存成功的函数
+        
+    返回:
+        bool: 是否保存成功
+    """
+    with _CONFIG_LOCK:
+        if update(_get_workflow_config()):
+            return True
+        _cached_workflow_config.clear()
+        return False
+
 def clear_form():
     """清空表单数据"""
     if "form_submitted" in st.session_state:
@@ -20,7 +73,7 @@ def render_workflow_manager():
     st.markdown("## 工作流管理")
     
     # 初始化工作流配置
-    workflow_config = WorkflowConfig()
+    workflow_config = _get_workflow_config()
     
     # 创建两列布局
     col1, col2 = st.columns([2, 1])
@@ -71,13 +124,13 @@ def render_workflow_manager():
                     params = {}
                     if parameters:
                         try:
-                            params = eval(parameters)
-                        except:
+                            params = json.loads(parameters)
+                        except json.JSONDecodeError:
                             st.error("参数格式错误，请使用正确的JSON格式")
                             return
                     
                     # 添加工作流
-                    if workflow_config.add_workflow(workflow_id, name, description, model, params):
+                    if _update_workflows(lambda config: config.add_workflow(workflow_id, name, description, model, params)):
                         st.success("工作流添加成功！")
                         # 标记表单已提交
                         st.session_state.form_submitted = True
@@ -96,10 +149,12 @@ def render_workflow_manager():
         
         if workflows:
             # 选择要删除的工作流
+            workflow_keys = list(workflows)
+            labels = {key: f"{info['name']} ({key})" for key, info in workflows.items()}
             workflow_to_delete = st.selectbox(
                 "选择要删除的工作流",
-                options=list(workflows.keys()),
-                format_func=lambda x: f"{workflows[x]['name']} ({x})"
+                options=workflow_keys,
+                format_func=labels.get
             )
             
             # 显示选中工作流的详细信息
@@ -117,7 +172,7 @@ def render_workflow_manager():
                 
                 # 删除按钮
                 if st.button(f"删除 {workflow['name']}"):
-                    if workflow_config.remove_workflow(workflow_to_delete):
+                    if _update_workflows(lambda config: config.remove_workflow(workflow_to_delete)):
                         st.success("工作流删除成功！")
                         st.rerun()
                     else:
@@ -127,7 +182,7 @@ def render_workflow_manager():
         
         # 清空所有工作流的按钮
         if workflows and st.button("清空所有工作流", type="secondary"):
-            if workflow_config.clear_workflows():
+            if _update_workflows(lambda config: config.clear_workflows()):
                 st.success("所有工作流已清空！")
                 st.rerun()
             else:
@@ -143,19 +198,24 @@ def get_workflow_selector(default_id=None):
     返回:
         tuple: (selected_workflow_id, workflow_info)
     """
-    workflow_config = WorkflowConfig()
+    workflow_config = _get_workflow_config()
     workflows = workflow_config.get_all_workflows()
     
     if not workflows:
         st.warning("未找到任何工作流配置，请先添加工作流")
         return None, None
     
-    # 创建工作流选择器
+    # 创建工作流选择器（键列表和显示标签只构建一次，选择框直接查表）
+    workflow_keys = list(workflows)
+    labels = {
+        key: f"{info['name']} - {info['description'][:50]}..."
+        for key, info in workflows.items()
+    }
     selected_id = st.selectbox(
         "选择工作流",
-        options=list(workflows.keys()),
-        index=list(workflows.keys()).index(default_id) if default_id in workflows else 0,
-        format_func=lambda x: f"{workflows[x]['name']} - {workflows[x]['description'][:50]}..."
+        options=workflow_keys,
+        index=next((i for i, key in enumerate(workflow_keys) if key == default_id), 0),
+        format_func=labels.get
     )
     
     return selected_id, workflows.get(selected_id) 
\ No newline at end of file
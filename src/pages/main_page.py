@@ -8,6 +8,50 @@ from src.components.image_analysis import render_image_analysis
 from src.components.image_generation import render_image_generation
 from src.components.workflow_manager import render_workflow_manager
 
+def _theme_preview_html(theme_name, theme_config, active):
+    """
+    生成主题预览卡片的HTML
+    
+    参数:
+        theme_name (str): 主题名称
+        theme_config (dict): 主题配置
+        active (bool): 是否为当前选中的主题（显示高亮边框）
+        
+    返回:
+        str: HTML代码
+    """
+    border_color = theme_config['primary_color'] if active else 'transparent'
+    return f"""
+                    <div style="background-color: {theme_config['background_color']}; 
+                                padding: 10px; 
+                                border-radius: 5px;
+                                border: 2px solid {border_color};
+                                text-align: center;
+                                cursor: pointer;">
+                        <h4 style="color: {theme_config['primary_color']}; margin: 5px 0;">{theme_name}</h4>
+                        <div style="background-color: {theme_config['primary_color']}; height: 15px; margin: 5px 0;"></div>
+                        <p style="color: {theme_config['text_color']}; margin: 5px 0;">示例文本</p>
+                    </div>
+                    """
+
+# 主题预览HTML在导入时生成一次：{主题名称: (选中时的HTML, 未选中时的HTML)}
+_THEME_PREVIEWS = {
+    name: (_theme_preview_html(name, config, True), _theme_preview_html(name, config, False))
+    for name, config in THEMES.items()
+}
+
+def _select_theme(theme_name):
+    """主题按钮回调：回调在页面脚本之前执行，本次运行即可应用新主题，无需再次 rerun"""
+    st.session_state.theme = theme_name
+
+def _apply_font():
+    """字体选择框回调"""
+    st.session_state.font = st.session_state.font_selector
+
+def _close_contact():
+    """关闭联系方式回调"""
+    st.session_state.show_contact = False
+
 def render_theme_settings():
     """渲染主题设置部分"""
     with st.expander("🎨 应用主题设置", expanded=False):
@@ -22,43 +66,32 @@ def render_theme_settings():
             st.session_state.font = "默认字体"
         
         # 显示主题选项
-        for i, (theme_name, theme_config) in enumerate(THEMES.items()):
+        for i, theme_name in enumerate(THEMES):
             with theme_cols[i]:
-                # 创建主题样式预览
+                # 显示主题样式预览（当前主题带高亮边框）
+                active_html, inactive_html = _THEME_PREVIEWS[theme_name]
                 st.markdown(
-                    f"""
-                    <div style="background-color: {theme_config['background_color']}; 
-                                padding: 10px; 
-                                border-radius: 5px;
-                                border: 2px solid {theme_config['primary_color'] if theme_name == st.session_state.theme else 'transparent'};
-                                text-align: center;
-                                cursor: pointer;">
-                        <h4 style="color: {theme_config['primary_color']}; margin: 5px 0;">{theme_name}</h4>
-                        <div style="background-color: {theme_config['primary_color']}; height: 15px; margin: 5px 0;"></div>
-                        <p style="color: {theme_config['text_color']}; margin: 5px 0;">示例文本</p>
-                    </div>
-                    """, 
+                    active_html if theme_name == st.session_state.theme else inactive_html,
                     unsafe_allow_html=True
                 )
                 
                 # 使用按钮选择主题
-                if st.button(f"选择 {theme_name}", key=f"theme_{theme_name}"):
-                    st.session_state.theme = theme_name
-                    st.experimental_rerun()
+                st.button(
+                    f"选择 {theme_name}",
+                    key=f"theme_{theme_name}",
+                    on_click=_select_theme,
+                    args=(theme_name,)
+                )
         
         # 字体选择
         st.write("### 字体设置")
-        selected_font = st.selectbox(
+        st.selectbox(
             "选择字体风格",
             options=list(FONTS.keys()),
             index=list(FONTS.keys()).index(st.session_state.get("font", "默认字体")),
-            key="font_selector"
+            key="font_selector",
+            on_change=_apply_font
         )
-        
-        # 如果字体被改变
-        if selected_font != st.session_state.get("font"):
-            st.session_state.font = selected_font
-            st.experimental_rerun()
 
 def render_contact_section():
     """渲染联系方式部分"""
@@ -73,9 +106,7 @@ def render_contact_section():
             - 📱 电话：123-4567-8900
             """)
             
-            if st.button("关闭", key="close_contact"):
-                st.session_state.show_contact = False
-                st.experimental_rerun()
+            st.button("关闭", key="close_contact", on_click=_close_contact)
 
 def render_main_page():
     """渲染主页面"""
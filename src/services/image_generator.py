@@ -3,15 +3,22 @@
 """
 
 import os
-import json
+import orjson
+import asyncio
+import hashlib
+import mmap
 import time
 import random
+import shutil
+import uuid
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import urllib3
 import logging
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
 
 # 配置日志
 logging.basicConfig(level=logging.DEBUG)
@@ -24,6 +31,65 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 API_KEY = os.getenv("RUNNINGHUB_API_KEY", "")
 API_BASE_URL = "https://www.runninghub.cn"
 
+# 输出目录固定在项目根目录下（与当前工作目录无关）；导入时只计算路径，目录在首次写入图片时创建
+_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "outputs")
+_CACHE_DIR = os.path.join(_OUTPUT_DIR, "cache")
+
+# 生成结果缓存的有效期（秒），默认24小时
+CACHE_TTL = int(os.getenv("RUNNINGHUB_CACHE_TTL", str(24 * 3600)))
+
+# 模块级共享会话：未传入会话的调用都复用同一个连接池和 keep-alive 连接
+# 幂等的接口（上传、查询状态、获取输出、下载图像）统一由连接池重试：连接错误、读取超时，
+# 以及限流（429）和服务端临时错误（5xx）按指数退避重试并遵循 Retry-After；
+# 状态码重试用尽后返回最后一次响应，由调用处按状态码报告错误
+_RETRY = Retry(
+    total=5,
+    connect=5,
+    read=5,
+    status=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["POST", "GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+# 创建任务不是幂等的：读取超时或 5xx 时任务可能已被接受，重试会重复提交并计费，
+# 因此只重试连接失败（请求未发出）和限流（429，请求被拒绝）
+_CREATE_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    other=0,
+    status=3,
+    backoff_factor=0.5,
+    status_forcelist=[429],
+    allowed_methods=["POST"],
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+_CREATE_URL = f"{API_BASE_URL}/task/openapi/create"
+_SESSION = requests.Session()
+_SESSION.verify = False  # 禁用 SSL 验证
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=_RETRY))
+# requests 按最长前缀匹配适配器，创建任务的请求使用单独的重试策略
+_SESSION.mount(_CREATE_URL, HTTPAdapter(pool_connections=2, pool_maxsize=20, max_retries=_CREATE_RETRY))
+
+# 所有请求共用的默认请求头（Host 由 requests 根据 URL 自动设置）
+_DEFAULT_HEADERS = {
+    "Accept": "*/*",
+    "Connection": "keep-alive",
+    "User-Agent": "Apifox/1.0.0 (https://apifox.com)"
+}
+_SESSION.headers.update(_DEFAULT_HEADERS)
+
+# JSON 接口的请求头：Content-Type 不放入会话默认值，否则会覆盖上传接口的 multipart 类型；
+# 同时带上默认请求头，调用方传入的会话也发送相同的请求头
+_JSON_HEADERS = {"Content-Type": "application/json", **_DEFAULT_HEADERS}
+
+# 允许上传的图片格式及对应的 MIME 类型
+_ALLOWED_EXTS = frozenset({'.png', '.jpg', '.jpeg'})
+_MIME = {'.png': 'image/png', '.jpg': 'image/jpeg', '.jpeg': 'image/jpeg'}
+
 class WorkflowType(Enum):
     TEXT_TO_IMAGE = "text_to_image"
     IMAGE_TO_IMAGE = "image_to_image"
@@ -33,12 +99,17 @@ def validate_api_key() -> None:
     if not API_KEY:
         raise ValueError("未设置 API 密钥，请设置环境变量 RUNNINGHUB_API_KEY")
 
-def validate_workflow_id(workflow_id: str) -> None:
-    """验证工作流 ID"""
+def validate_workflow_id(workflow_id: str) -> int:
+    """验证工作流 ID，返回转换后的整数 ID"""
     if not workflow_id:
         raise ValueError("工作流 ID 不能为空")
-    if not workflow_id.isdigit():
+    # 只接受 ASCII 数字：int() 还会接受 "+5"、" 5 "、"1_000" 和全角数字
+    if not (isinstance(workflow_id, str) and workflow_id.isascii() and workflow_id.isdigit()):
         raise ValueError("工作流 ID 必须是数字")
+    value = int(workflow_id)
+    if value <= 0:
+        raise ValueError("工作流 ID 必须是正整数")
+    return value
 
 def validate_prompt(prompt: str) -> None:
     """验证提示词"""
@@ -47,12 +118,13 @@ def validate_prompt(prompt: str) -> None:
     if len(prompt.strip()) == 0:
         raise ValueError("提示词不能只包含空白字符")
 
-def upload_image(image_path: str) -> Dict[str, str]:
+def upload_image(image_path: str, session: Optional[requests.Session] = None) -> Dict[str, str]:
     """
     上传图片到 RunningHub
     
     参数:
         image_path (str): 图片文件路径
+        session (requests.Session, optional): 复用的HTTP会话，不提供则使用模块级共享会话
         
     返回:
         dict: 包含上传结果的字典，格式为：
@@ -65,24 +137,25 @@ def upload_image(image_path: str) -> Dict[str, str]:
         ValueError: 当图片文件不存在或格式不支持时
         Exception: 当上传过程中发生错误时
     """
-    logger.info(f"开始上传图片: {image_path}")
+    logger.info("开始上传图片: %s", image_path)
     
-    if not os.path.exists(image_path):
+    # 一次 stat 同时完成存在性检查和大小获取
+    try:
+        file_size = os.stat(image_path).st_size
+    except FileNotFoundError:
         error_msg = f"图片文件不存在: {image_path}"
         logger.error(error_msg)
         raise ValueError(error_msg)
     
     # 检查文件扩展名
-    allowed_extensions = {'.png', '.jpg', '.jpeg'}
     file_ext = os.path.splitext(image_path)[1].lower()
-    if file_ext not in allowed_extensions:
-        error_msg = f"不支持的图片格式: {file_ext}，支持的格式: {', '.join(allowed_extensions)}"
+    if file_ext not in _ALLOWED_EXTS:
+        error_msg = f"不支持的图片格式: {file_ext}，支持的格式: {', '.join(sorted(_ALLOWED_EXTS))}"
         logger.error(error_msg)
         raise ValueError(error_msg)
     
     # 检查文件大小（限制为 10MB）
     max_size = 10 * 1024 * 1024  # 10MB in bytes
-    file_size = os.path.getsize(image_path)
     if file_size > max_size:
         error_msg = f"图片文件过大: {file_size / 1024 / 1024:.2f}MB，最大允许: {max_size / 1024 / 1024}MB"
         logger.error(error_msg)
@@ -91,33 +164,36 @@ def upload_image(image_path: str) -> Dict[str, str]:
     try:
         # 准备上传请求
         upload_url = f"{API_BASE_URL}/task/openapi/upload"
-        logger.info(f"调用上传API: {upload_url}")
+        logger.info("调用上传API: %s", upload_url)
         
-        # 准备 multipart/form-data 表单数据
-        files = {
-            'file': (os.path.basename(image_path), open(image_path, 'rb'), 'image/jpeg' if file_ext in ['.jpg', '.jpeg'] else 'image/png')
-        }
         data = {
             'apiKey': API_KEY,
             'fileType': 'image'
         }
         
-        # 发送上传请求
-        upload_response = requests.post(
-            upload_url,
-            files=files,
-            data=data,
-            verify=False,
-            timeout=30
-        )
+        # 发送上传请求（与创建任务、轮询状态共用同一个连接池）
+        if session is None:
+            session = _SESSION
+        # 准备 multipart/form-data 表单数据，请求结束后立即关闭文件句柄
+        with open(image_path, 'rb') as image_file:
+            files = {
+                'file': (os.path.basename(image_path), image_file, _MIME[file_ext])
+            }
+            upload_response = session.post(
+                upload_url,
+                files=files,
+                data=data,
+                timeout=30
+            )
         
-        logger.debug(f"API响应状态码: {upload_response.status_code}")
-        logger.debug(f"API响应内容: {upload_response.text}")
+        logger.debug("API响应状态码: %s", upload_response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API响应内容: %s", upload_response.text)
         
         if upload_response.status_code != 200:
             error_msg = f"上传失败 (状态码: {upload_response.status_code})"
             try:
-                error_data = upload_response.json()
+                error_data = orjson.loads(upload_response.content)
                 error_msg += f": {error_data.get('msg', '未知错误')}"
             except:
                 error_msg += f": {upload_response.text}"
@@ -125,8 +201,8 @@ def upload_image(image_path: str) -> Dict[str, str]:
             raise Exception(error_msg)
         
         try:
-            result = upload_response.json()
-        except json.JSONDecodeError:
+            result = orjson.loads(upload_response.content)
+        except orjson.JSONDecodeError:
             error_msg = f"无效的 JSON 响应: {upload_response.text}"
             logger.error(error_msg)
             raise Exception(error_msg)
@@ -137,7 +213,7 @@ def upload_image(image_path: str) -> Dict[str, str]:
             raise Exception(error_msg)
         
         upload_result = result["data"]
-        logger.info(f"图片上传成功: {upload_result['fileName']}")
+        logger.info("图片上传成功: %s", upload_result['fileName'])
         return upload_result
         
     except requests.Timeout:
@@ -166,7 +242,7 @@ def get_node_id_by_field(workflow_config: dict, field_name: str) -> Optional[str
     try:
         # 确保 workflow_config 是字典类型
         if not isinstance(workflow_config, dict):
-            logger.warning(f"workflow_config 不是字典类型: {type(workflow_config)}")
+            logger.warning("workflow_config 不是字典类型: %s", type(workflow_config))
             return None
             
         # 获取 nodeInfoList
@@ -179,8 +255,100 @@ def get_node_id_by_field(workflow_config: dict, field_name: str) -> Optional[str
                     return str(node_id) if node_id is not None else None
         return None
     except Exception as e:
-        logger.warning(f"获取节点 ID 失败 (字段: {field_name}): {str(e)}")
+        logger.warning("获取节点 ID 失败 (字段: %s): %s", field_name, e)
+        return None
+
+def _file_digest(path: str) -> str:
+    """
+    计算文件内容的 BLAKE2b 摘要，不把整个文件读入内存
+    
+    参数:
+        path (str): 文件路径
+        
+    返回:
+        str: 32位十六进制字符串
+    """
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+：在 C 层分块读取并计算
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.blake2b(b"", digest_size=16).hexdigest()
+        # 旧版本：内存映射文件，由内核按需换入页面
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.blake2b(mm, digest_size=16).hexdigest()
+
+def _generation_cache_key(
+    prompt: str,
+    workflow_id: str,
+    workflow_config: dict,
+    workflow_type: WorkflowType,
+    reference_image_path: Optional[str],
+    negative_prompt: Optional[str],
+    seed: int
+) -> str:
+    """
+    计算生成结果缓存的键：相同的工作流、提示词、种子和参考图片内容得到相同的键
+    
+    参数:
+        与 generate_image_runninghub 相同
+        
+    返回:
+        str: 32位十六进制字符串
+    """
+    params = {
+        "workflow_id": str(workflow_id),
+        "workflow_type": workflow_type.value,
+        "node_info_list": (
+            workflow_config.get('parameters', {}).get('nodeInfoList', [])
+            if isinstance(workflow_config, dict) else []
+        ),
+        "prompt": prompt,
+        "negative_prompt": negative_prompt or "",
+        "seed": seed,
+    }
+    if reference_image_path:
+        # 参考图片按内容参与计算（上传文件的路径每次都不同）
+        params["reference_image"] = _file_digest(reference_image_path)
+    
+    payload = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _read_cached_result(cache_path: str, max_age: Optional[float] = CACHE_TTL) -> Optional[Dict[str, Any]]:
+    """
+    读取缓存的生成结果
+    
+    参数:
+        cache_path (str): 缓存图片路径，元数据保存在同名的 .json 文件中
+        max_age (float, optional): 最长有效期（秒），为 None 时不检查有效期
+        
+    返回:
+        Optional[Dict[str, Any]]: 缓存的生成结果，不存在或已过期时返回 None（过期的缓存文件会被删除）
+    """
+    meta_path = f"{os.path.splitext(cache_path)[0]}.json"
+    try:
+        mtime = os.stat(cache_path).st_mtime
+    except FileNotFoundError:
+        return None
+    if max_age is not None and time.time() - mtime > max_age:
+        # 删除过期的图片和元数据，缓存目录不会无限增长
+        for path in (cache_path, meta_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
         return None
+    
+    result = {"image_path": cache_path, "task_id": None, "status": "SUCCESS"}
+    try:
+        with open(meta_path, "rb") as f:
+            result.update(orjson.loads(f.read()))
+    except (OSError, orjson.JSONDecodeError):
+        pass
+    # created_at 只用于缓存管理，不属于生成结果
+    result.pop("created_at", None)
+    result["image_path"] = cache_path
+    return result
 
 def generate_image_runninghub(
     prompt: str,
@@ -189,7 +357,9 @@ def generate_image_runninghub(
     workflow_type: WorkflowType = WorkflowType.TEXT_TO_IMAGE,
     reference_image_path: Optional[str] = None,
     negative_prompt: Optional[str] = None,
-    seed: Optional[int] = None
+    seed: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+    cache_usage_policy: str = "always"
 ) -> Optional[Dict[str, Any]]:
     """
     使用RunningHub API生成图像
@@ -202,41 +372,50 @@ def generate_image_runninghub(
         reference_image_path (str, optional): 参考图片路径（用于图生图）
         negative_prompt (str, optional): 反向提示词
         seed (int, optional): 随机种子
+        session (requests.Session, optional): 复用的HTTP会话，不提供则使用模块级共享会话
+        cache_usage_policy (str): 缓存使用策略（仅在指定种子时生效）：
+            "always" 有效期内的缓存结果直接返回；
+            "on_error" 总是重新生成，仅在生成失败时返回已有的缓存结果
         
     返回:
         Optional[Dict[str, Any]]: 生成结果
     """
+    cache_path = None
     try:
         # 验证参数
         validate_api_key()
-        validate_workflow_id(workflow_id)
+        workflow_id_int = validate_workflow_id(workflow_id)
         validate_prompt(prompt)
         
         if workflow_type == WorkflowType.IMAGE_TO_IMAGE and not reference_image_path:
             raise ValueError("图生图模式需要提供参考图片")
         
-        logger.info(f"开始生成图像 - 工作流ID: {workflow_id}")
-        logger.debug(f"工作流类型: {workflow_type.value}")
-        logger.debug(f"提示词: {prompt}")
-        logger.debug(f"反向提示词: {negative_prompt}")
-        logger.debug(f"参考图片: {reference_image_path}")
-        logger.debug(f"种子: {seed}")
-        
-        # 确保输出目录存在
-        output_dir = os.path.join(os.getcwd(), "outputs")
-        os.makedirs(output_dir, exist_ok=True)
-        logger.debug(f"输出目录: {output_dir}")
-        
-        # 准备请求头
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "*/*",
-            "Host": "www.runninghub.cn",
-            "Connection": "keep-alive",
-            "User-Agent": "Apifox/1.0.0 (https://apifox.com)"
-        }
+        logger.info("开始生成图像 - 工作流ID: %s", workflow_id)
+        logger.debug("工作流类型: %s", workflow_type.value)
+        logger.debug("提示词: %s", prompt)
+        logger.debug("反向提示词: %s", negative_prompt)
+        logger.debug("参考图片: %s", reference_image_path)
+        logger.debug("种子: %s", seed)
+        
+        # 指定了种子时结果是确定的：相同参数的结果直接从缓存返回，不再调用API
+        if seed is not None:
+            cache_key = _generation_cache_key(
+                prompt, workflow_id, workflow_config, workflow_type,
+                reference_image_path, negative_prompt, seed
+            )
+            cache_path = os.path.join(_CACHE_DIR, f"{cache_key}.png")
+            if cache_usage_policy == "always":
+                cached = _read_cached_result(cache_path)
+                if cached:
+                    logger.info("命中生成结果缓存: %s", cache_path)
+                    return cached
+        
         logger.debug("API密钥是否存在: %s", bool(API_KEY))
         
+        # 未传入会话时使用模块级共享会话
+        if session is None:
+            session = _SESSION
+        
         # 准备 nodeInfoList
         node_info_list = []
         
@@ -259,17 +438,17 @@ def generate_image_runninghub(
                             for node in node_info_list:
                                 if isinstance(node, dict) and 'nodeId' in node:
                                     image_node_id = str(node.get('nodeId'))
-                                    logger.warning(f"使用找到的第一个节点作为图片节点: {image_node_id}")
+                                    logger.warning("使用找到的第一个节点作为图片节点: %s", image_node_id)
                                     break
                 
                 if not image_node_id:
                     raise ValueError("未找到图片节点配置")
-                logger.debug(f"LoadImage 节点 ID: {image_node_id}")
+                logger.debug("LoadImage 节点 ID: %s", image_node_id)
                 
                 # 上传图片
-                upload_result = upload_image(reference_image_path)
+                upload_result = upload_image(reference_image_path, session=session)
                 uploaded_filename = upload_result["fileName"]
-                logger.debug(f"上传的图片文件名: {uploaded_filename}")
+                logger.debug("上传的图片文件名: %s", uploaded_filename)
                 
                 # 添加图片节点信息
                 node_info_list.append({
@@ -278,12 +457,12 @@ def generate_image_runninghub(
                     "fieldValue": uploaded_filename
                 })
             except Exception as e:
-                logger.error(f"处理参考图片失败: {str(e)}")
+                logger.error("处理参考图片失败: %s", e)
                 raise e
         
         # 获取完整的节点列表
         original_node_list = workflow_config.get('parameters', {}).get('nodeInfoList', [])
-        logger.debug(f"原始节点列表: {original_node_list}")
+        logger.debug("原始节点列表: %s", original_node_list)
         
         # 处理每个节点
         for node_info in original_node_list:
@@ -311,7 +490,7 @@ def generate_image_runninghub(
             elif field_name == 'seed':
                 if seed is None:
                     seed = random.randint(0, 2**32-1)
-                    logger.debug(f"生成的随机种子: {seed}")
+                    logger.debug("生成的随机种子: %s", seed)
                     
                 node_info_list.append({
                     "nodeId": str(node_id),
@@ -328,7 +507,7 @@ def generate_image_runninghub(
         
         # 准备请求数据
         data = {
-            "workflowId": int(workflow_id),  # 转换为整数
+            "workflowId": workflow_id_int,
             "apiKey": API_KEY,
             "nodeInfoList": node_info_list
         }
@@ -336,32 +515,30 @@ def generate_image_runninghub(
         if negative_prompt:
             data["negative_prompt"] = negative_prompt
             
-        logger.debug(f"请求数据: {json.dumps(data, ensure_ascii=False, indent=2)}")
-        logger.debug(f"工作流配置: {json.dumps(workflow_config, ensure_ascii=False, indent=2)}")
-        
-        # 创建会话并配置
-        session = requests.Session()
-        session.verify = False  # 禁用 SSL 验证
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("请求数据: %s", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+            logger.debug("工作流配置: %s", orjson.dumps(workflow_config, option=orjson.OPT_INDENT_2).decode())
         
         # 创建任务
-        create_url = f"{API_BASE_URL}/task/openapi/create"
-        logger.info(f"调用创建任务API: {create_url}")
+        create_url = _CREATE_URL
+        logger.info("调用创建任务API: %s", create_url)
         
         create_response = session.post(
             create_url,
-            headers=headers,
-            json=data,
+            headers=_JSON_HEADERS,
+            data=orjson.dumps(data),
             timeout=30  # 设置30秒超时
         )
         
-        logger.debug(f"API响应状态码: {create_response.status_code}")
-        logger.debug(f"API响应头: {dict(create_response.headers)}")
-        logger.debug(f"API响应内容: {create_response.text}")
+        logger.debug("API响应状态码: %s", create_response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("API响应头: %s", dict(create_response.headers))
+            logger.debug("API响应内容: %s", create_response.text)
         
         if create_response.status_code != 200:
             error_msg = f"API错误 (状态码: {create_response.status_code})"
             try:
-                error_data = create_response.json()
+                error_data = orjson.loads(create_response.content)
                 error_msg += f": {error_data.get('msg', '未知错误')}"
             except:
                 error_msg += f": {create_response.text}"
@@ -369,8 +546,8 @@ def generate_image_runninghub(
             raise Exception(error_msg)
         
         try:
-            result = create_response.json()
-        except json.JSONDecodeError:
+            result = orjson.loads(create_response.content)
+        except orjson.JSONDecodeError:
             error_msg = f"无效的 JSON 响应: {create_response.text}"
             logger.error(error_msg)
             raise Exception(error_msg)
@@ -382,19 +559,22 @@ def generate_image_runninghub(
         
         task_id = result["data"]["taskId"]
         client_id = result["data"]["clientId"]
-        logger.info(f"获取到任务ID: {task_id}")
-        logger.info(f"获取到客户端ID: {client_id}")
-        
-        # 轮询任务状态
-        max_retries = 60  # 增加最大重试次数
-        retry_interval = 5  # 增加重试间隔
-        
-        for attempt in range(max_retries):
-            logger.debug(f"检查任务状态 (尝试 {attempt + 1}/{max_retries})")
+        logger.info("获取到任务ID: %s", task_id)
+        logger.info("获取到客户端ID: %s", client_id)
+        
+        # 轮询任务状态：间隔从0.5秒开始倍增（最长8秒），总等待时间不超过5分钟；
+        # 很快完成的任务不必等满一个固定间隔才被发现
+        deadline = time.monotonic() + 300
+        retry_interval = 0.5
+        attempt = 0
+        
+        while time.monotonic() < deadline:
+            attempt += 1
+            logger.debug("检查任务状态 (第 %s 次)", attempt)
             
             # 检查任务状态
             status_url = f"{API_BASE_URL}/task/openapi/status"
-            logger.debug(f"调用状态API: {status_url}")
+            logger.debug("调用状态API: %s", status_url)
             
             status_data = {
                 "taskId": task_id,
@@ -402,31 +582,29 @@ def generate_image_runninghub(
                 "clientId": client_id
             }
             
-            logger.debug(f"状态请求数据: {json.dumps(status_data, ensure_ascii=False)}")
-            
+            # 查询状态是幂等的：连接池重试用尽后（或调用方传入的会话没有重试策略时），
+            # 单次查询失败不放弃整个任务，等待后在截止时间内继续轮询
             try:
                 status_response = session.post(
                     status_url,
-                    headers=headers,
-                    json=status_data,
+                    headers=_JSON_HEADERS,
+                    data=orjson.dumps(status_data),
                     timeout=30  # 设置30秒超时
                 )
-            except requests.Timeout:
-                logger.warning("状态检查请求超时，将在下次重试")
-                time.sleep(retry_interval)
-                continue
             except requests.RequestException as e:
-                logger.warning(f"状态检查请求失败: {str(e)}，将在下次重试")
+                logger.warning("状态检查请求失败: %s，将在下次重试", e)
                 time.sleep(retry_interval)
+                retry_interval = min(retry_interval * 2, 8)
                 continue
             
-            logger.debug(f"状态API响应状态码: {status_response.status_code}")
-            logger.debug(f"状态API响应内容: {status_response.text}")
+            logger.debug("状态API响应状态码: %s", status_response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("状态API响应内容: %s", status_response.text)
             
             if status_response.status_code != 200:
                 error_msg = f"获取任务状态失败 (状态码: {status_response.status_code})"
                 try:
-                    error_data = status_response.json()
+                    error_data = orjson.loads(status_response.content)
                     error_msg += f": {error_data.get('msg', '未知错误')}"
                 except:
                     error_msg += f": {status_response.text}"
@@ -434,8 +612,8 @@ def generate_image_runninghub(
                 raise Exception(error_msg)
             
             try:
-                status_result = status_response.json()
-            except json.JSONDecodeError:
+                status_result = orjson.loads(status_response.content)
+            except orjson.JSONDecodeError:
                 error_msg = f"无效的任务状态响应: {status_response.text}"
                 logger.error(error_msg)
                 raise Exception(error_msg)
@@ -447,12 +625,12 @@ def generate_image_runninghub(
             
             # 从data字段获取状态
             status = status_result["data"]
-            logger.info(f"当前任务状态: {status}")
+            logger.info("当前任务状态: %s", status)
             
             if status == "SUCCESS":
                 # 获取任务输出
                 outputs_url = f"{API_BASE_URL}/task/openapi/outputs"
-                logger.debug(f"调用输出API: {outputs_url}")
+                logger.debug("调用输出API: %s", outputs_url)
                 
                 outputs_data = {
                     "taskId": task_id,
@@ -463,8 +641,8 @@ def generate_image_runninghub(
                 try:
                     outputs_response = session.post(
                         outputs_url,
-                        headers=headers,
-                        json=outputs_data,
+                        headers=_JSON_HEADERS,
+                        data=orjson.dumps(outputs_data),
                         timeout=30  # 设置30秒超时
                     )
                 except requests.Timeout:
@@ -476,13 +654,14 @@ def generate_image_runninghub(
                     logger.error(error_msg)
                     raise Exception(error_msg)
                 
-                logger.debug(f"输出API响应状态码: {outputs_response.status_code}")
-                logger.debug(f"输出API响应内容: {outputs_response.text}")
+                logger.debug("输出API响应状态码: %s", outputs_response.status_code)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("输出API响应内容: %s", outputs_response.text)
                 
                 if outputs_response.status_code != 200:
                     error_msg = f"获取任务输出失败 (状态码: {outputs_response.status_code})"
                     try:
-                        error_data = outputs_response.json()
+                        error_data = orjson.loads(outputs_response.content)
                         error_msg += f": {error_data.get('msg', '未知错误')}"
                     except:
                         error_msg += f": {outputs_response.text}"
@@ -490,8 +669,8 @@ def generate_image_runninghub(
                     raise Exception(error_msg)
                 
                 try:
-                    outputs_result = outputs_response.json()
-                except json.JSONDecodeError:
+                    outputs_result = orjson.loads(outputs_response.content)
+                except orjson.JSONDecodeError:
                     error_msg = f"无效的任务输出响应: {outputs_response.text}"
                     logger.error(error_msg)
                     raise Exception(error_msg)
@@ -509,11 +688,25 @@ def generate_image_runninghub(
                     raise Exception(error_msg)
                 
                 image_url = outputs[0]["fileUrl"]  # 从第一个输出项获取fileUrl
-                logger.info(f"开始下载图像: {image_url}")
+                logger.info("开始下载图像: %s", image_url)
                 
+                # 保存图像
+                # 文件名带上任务ID，同一秒内完成的多个任务（如批量生成）不会互相覆盖
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                image_path = cache_path or os.path.join(_OUTPUT_DIR, f"generated_{timestamp}_{task_id}.png")
+                
+                # 以流式方式边接收边写入临时文件，不在内存中缓存完整图像；
+                # 下载完成后再重命名，避免中断的下载在缓存中留下不完整的文件。
+                # 临时文件名带随机后缀：并发的相同任务（缓存键相同）不会写入同一个临时文件
+                partial_path = f"{image_path}.{uuid.uuid4().hex}.part"
+                os.makedirs(os.path.dirname(image_path), exist_ok=True)
                 try:
-                    image_response = session.get(image_url, timeout=30)  # 设置30秒超时
-                    image_response.raise_for_status()
+                    with session.get(image_url, timeout=30, stream=True) as image_response:  # 设置30秒超时
+                        image_response.raise_for_status()
+                        image_response.raw.decode_content = True
+                        with open(partial_path, "wb") as f:
+                            shutil.copyfileobj(image_response.raw, f, length=64 * 1024)
+                    os.replace(partial_path, image_path)
                 except requests.Timeout:
                     error_msg = "下载图像超时"
                     logger.error(error_msg)
@@ -522,27 +715,35 @@ def generate_image_runninghub(
                     error_msg = f"下载图像失败: {str(e)}"
                     logger.error(error_msg)
                     raise Exception(error_msg)
+                finally:
+                    # 下载失败时删除临时文件（成功时已被重命名，不存在）
+                    try:
+                        os.remove(partial_path)
+                    except FileNotFoundError:
+                        pass
                 
-                # 保存图像
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                image_path = os.path.join(output_dir, f"generated_{timestamp}.png")
-                
-                with open(image_path, "wb") as f:
-                    f.write(image_response.content)
-                
-                logger.info(f"图像已保存到: {image_path}")
-                return {
+                logger.info("图像已保存到: %s", image_path)
+                result = {
                     "image_path": image_path,
                     "task_id": task_id,
                     "status": "SUCCESS"
                 }
+                if cache_path:
+                    # 缓存图片旁保存结果元数据，命中缓存时一并返回
+                    try:
+                        with open(f"{os.path.splitext(cache_path)[0]}.json", "wb") as f:
+                            f.write(orjson.dumps({**result, "created_at": time.time()}))
+                    except OSError as e:
+                        logger.warning("写入缓存元数据失败: %s", e)
+                return result
             elif status == "FAILED":
                 error_msg = "任务执行失败"
                 logger.error(error_msg)
                 raise Exception(error_msg)
             elif status == "RUNNING":
-                logger.debug(f"任务正在运行，等待 {retry_interval} 秒后重试")
+                logger.debug("任务正在运行，等待 %s 秒后重试", retry_interval)
                 time.sleep(retry_interval)
+                retry_interval = min(retry_interval * 2, 8)
             else:
                 error_msg = f"未知的任务状态: {status}"
                 logger.error(error_msg)
@@ -555,4 +756,91 @@ def generate_image_runninghub(
     except Exception as e:
         logger.exception("图像生成过程中发生错误")
         print(f"图像生成失败: {str(e)}")
-        return None 
\ No newline at end of file
+        if cache_path and cache_usage_policy == "on_error":
+            # 生成失败时退回到已有的缓存结果（不论是否过期）
+            cached = _read_cached_result(cache_path, max_age=None)
+            if cached:
+                logger.warning("生成失败，返回缓存结果: %s", cache_path)
+                return cached
+        return None
+
+def generate_images_runninghub(
+    prompts: List[str],
+    workflow_id: str,
+    workflow_config: dict,
+    workflow_type: WorkflowType = WorkflowType.TEXT_TO_IMAGE,
+    reference_image_path: Optional[str] = None,
+    negative_prompt: Optional[str] = None,
+    seed: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+    max_workers: int = 4
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    批量生成图像，多个提示词的任务并发提交和轮询，共享同一个HTTP会话
+    
+    参数:
+        prompts (List[str]): 正向提示词列表
+        max_workers (int): 最大并发任务数
+        其余参数与 generate_image_runninghub 相同，对所有提示词生效
+        
+    返回:
+        List[Optional[Dict[str, Any]]]: 与 prompts 顺序对应的生成结果，失败的项为 None
+    """
+    if not prompts:
+        return []
+    
+    if session is None:
+        session = _SESSION
+    
+    def generate(prompt):
+        return generate_image_runninghub(
+            prompt=prompt,
+            workflow_id=workflow_id,
+            workflow_config=workflow_config,
+            workflow_type=workflow_type,
+            reference_image_path=reference_image_path,
+            negative_prompt=negative_prompt,
+            seed=seed,
+            session=session
+        )
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+        return list(pool.map(generate, prompts))
+
+async def generate_images_runninghub_async(
+    prompts: List[str],
+    workflow_id: str,
+    workflow_config: dict,
+    workflow_type: WorkflowType = WorkflowType.TEXT_TO_IMAGE,
+    reference_image_path: Optional[str] = None,
+    negative_prompt: Optional[str] = None,
+    seed: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+    max_concurrency: int = 4
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    批量生成图像的异步版本，可在事件循环中与其他任务并发等待
+    
+    在线程中调用 generate_images_runninghub 完成整批任务；
+    同步代码（如 Streamlit 页面）中可通过 asyncio.run 调用
+    
+    参数:
+        prompts (List[str]): 正向提示词列表
+        max_concurrency (int): 最大并发任务数
+        其余参数与 generate_image_runninghub 相同，对所有提示词生效
+        
+    返回:
+        List[Optional[Dict[str, Any]]]: 与 prompts 顺序对应的生成结果，失败的项为 None
+    """
+    return await asyncio.to_thread(
+        generate_images_runninghub,
+        prompts=prompts,
+        workflow_id=workflow_id,
+        workflow_config=workflow_config,
+        workflow_type=workflow_type,
+        reference_image_path=reference_image_path,
+        negative_prompt=negative_prompt,
+        seed=seed,
+        session=session,
+        max_workers=max_concurrency
+    )
@@ -2,6 +2,9 @@
 主题样式配置模块
 """
 
+from functools import lru_cache
+from string import Template
+
 # 主题配置
 THEMES = {
     "默认蓝": {
@@ -31,77 +34,81 @@ FONTS = {
     "现代黑体": "'Noto Sans SC', sans-serif"
 }
 
-def get_theme_css(theme_name="默认蓝", font_name="默认字体"):
-    """
-    生成主题CSS样式
-    
-    参数:
-        theme_name (str): 主题名称
-        font_name (str): 字体名称
-        
-    返回:
-        str: CSS样式代码
-    """
-    theme = THEMES.get(theme_name, THEMES["默认蓝"])
-    font = FONTS.get(font_name, FONTS["默认字体"])
-    
-    return f"""
+# CSS 模板只构建一次，生成时仅做变量替换
+_CSS_TEMPLATE = Template("""
         <style>
             /* 全局样式 */
-            .stApp {{
-                font-family: {font};
-                color: {theme['text_color']};
-                background-color: {theme['background_color']};
-            }}
+            .stApp {
+                font-family: $font;
+                color: $text_color;
+                background-color: $background_color;
+            }
             
             /* 标题样式 */
-            .main-title {{
-                color: {theme['primary_color']};
+            .main-title {
+                color: $primary_color;
                 font-size: 2.5em;
                 font-weight: bold;
                 margin-bottom: 0.5em;
-            }}
+            }
             
-            .subtitle {{
-                color: {theme['secondary_color']};
+            .subtitle {
+                color: $secondary_color;
                 font-size: 1.2em;
                 margin-bottom: 2em;
-            }}
+            }
             
             /* 按钮样式 */
-            .stButton>button {{
-                background-color: {theme['primary_color']};
+            .stButton>button {
+                background-color: $primary_color;
                 color: white;
                 border: none;
                 border-radius: 4px;
                 padding: 0.5em 1em;
                 transition: all 0.3s ease;
-            }}
+            }
             
-            .stButton>button:hover {{
-                background-color: {theme['secondary_color']};
+            .stButton>button:hover {
+                background-color: $secondary_color;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-            }}
+            }
             
             /* 输入框样式 */
-            .stTextInput>div>div>input {{
-                border-color: {theme['primary_color']};
-            }}
+            .stTextInput>div>div>input {
+                border-color: $primary_color;
+            }
             
             /* 选择框样式 */
-            .stSelectbox>div>div>select {{
-                border-color: {theme['primary_color']};
-            }}
+            .stSelectbox>div>div>select {
+                border-color: $primary_color;
+            }
             
             /* 链接样式 */
-            a {{
-                color: {theme['primary_color']};
+            a {
+                color: $primary_color;
                 text-decoration: none;
-            }}
+            }
             
-            a:hover {{
-                color: {theme['secondary_color']};
+            a:hover {
+                color: $secondary_color;
                 text-decoration: underline;
-            }}
+            }
         </style>
-    """ 
\ No newline at end of file
+    """)
+
+@lru_cache(maxsize=16)
+def get_theme_css(theme_name="默认蓝", font_name="默认字体"):
+    """
+    生成主题CSS样式（结果按主题和字体缓存）
+    
+    参数:
+        theme_name (str): 主题名称
+        font_name (str): 字体名称
+        
+    返回:
+        str: CSS样式代码
+    """
+    theme = THEMES.get(theme_name, THEMES["默认蓝"])
+    font = FONTS.get(font_name, FONTS["默认字体"])
+    
+    return _CSS_TEMPLATE.substitute(theme, font=font)
@@ -2,8 +2,7 @@
 文件处理工具模块
 """
 
-import os
-import json
+import orjson
 
 def save_text_as_file(text, filename):
     """保存文本为文件"""
@@ -12,19 +11,18 @@ def save_text_as_file(text, filename):
 
 def create_download_button(st, text, filename, button_text):
     """创建下载按钮"""
-    # 转换text为字符串（如果是字典则进行JSON转换）
+    # 字典直接序列化为UTF-8编码的JSON字节，其他内容按文本处理
     if isinstance(text, dict):
-        text_str = json.dumps(text, ensure_ascii=False, indent=2)
+        data = orjson.dumps(text, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        mime = "application/json"
     else:
-        text_str = str(text)
-        
-    with open("temp.txt", "w", encoding="utf-8") as f:
-        f.write(text_str)
-    with open("temp.txt", "r", encoding="utf-8") as f:
-        st.download_button(
-            label=button_text,
-            data=f,
-            file_name=filename,
-            mime="text/plain"
-        )
-    os.remove("temp.txt") 
\ No newline at end of file
+        data = str(text).encode("utf-8")
+        mime = "text/plain"
+    
+    # 直接传入内存中的字节，无需临时文件
+    st.download_button(
+        label=button_text,
+        data=data,
+        file_name=filename,
+        mime=mime
+    )
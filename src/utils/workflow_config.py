@@ -2,35 +2,103 @@
 工作流配置模块
 """
 
-import json
 import os
+import orjson
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+# 设置环境变量 WORKFLOWS_COMPACT_JSON=1 时以紧凑格式保存配置文件；
+# 默认保持缩进格式，仓库中的 workflows.json 需要手工查看和编辑
+_SAVE_OPTION = 0 if os.getenv("WORKFLOWS_COMPACT_JSON") == "1" else orjson.OPT_INDENT_2
+
+# 串行化配置文件的写入：同一进程中的多个会话可能同时保存
+_SAVE_LOCK = threading.Lock()
+
+@lru_cache(maxsize=8)
+def _read_config(config_file, mtime_ns, size):
+    """
+    读取并解析配置文件，结果按文件路径、修改时间和大小缓存
+    
+    文件被修改后缓存键随之改变，下次读取时自动重新解析
+    """
+    with open(config_file, "rb") as f:
+        return orjson.loads(f.read())
 
 class WorkflowConfig:
     def __init__(self, config_file="workflows.json"):
         self.config_file = config_file
         self.workflows = self._load_config()
+        # 批量修改的嵌套层数，以及批量期间是否有未保存的修改
+        self._batch_depth = 0
+        self._dirty = False
 
     def _load_config(self):
         """加载工作流配置"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                stat = os.stat(self.config_file)
+                # 返回浅拷贝：增删工作流只修改顶层字典，不会影响缓存中的解析结果
+                return dict(_read_config(self.config_file, stat.st_mtime_ns, stat.st_size))
             except Exception as e:
                 print(f"加载配置文件失败: {e}")
                 return {}
         return {}
 
     def save_config(self):
-        """保存工作流配置"""
+        """保存工作流配置（先写临时文件再替换，中途失败不会留下不完整的配置文件）"""
+        if self._batch_depth:
+            # 批量修改期间只做标记，退出 batch() 时统一写入
+            self._dirty = True
+            return True
+        tmp_file = None
         try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                json.dump(self.workflows, f, ensure_ascii=False, indent=2)
+            with _SAVE_LOCK:
+                # 临时文件与配置文件位于同一目录（os.replace 要求同一文件系统），文件名唯一，并发保存不会互相覆盖
+                fd, tmp_file = tempfile.mkstemp(
+                    dir=os.path.dirname(os.path.abspath(self.config_file)),
+                    suffix=".tmp"
+                )
+                with os.fdopen(fd, "wb") as f:
+                    f.write(orjson.dumps(self.workflows, option=_SAVE_OPTION))
+                # mkstemp 创建的文件权限为 0600，沿用原配置文件的权限
+                try:
+                    os.chmod(tmp_file, os.stat(self.config_file).st_mode & 0o777)
+                except FileNotFoundError:
+                    pass
+                os.replace(tmp_file, self.config_file)
+                _read_config.cache_clear()
+            self._dirty = False
             return True
         except Exception as e:
             print(f"保存配置文件失败: {e}")
+            if tmp_file:
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
             return False
 
+    @contextmanager
+    def batch(self):
+        """
+        批量修改工作流配置，期间的增删操作在退出时只写入一次配置文件
+        
+        用法:
+            with config.batch():
+                config.add_workflow(...)
+                config.add_workflow(...)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            # 保存成功时 save_config 会清除未保存标记；失败时保留标记，可再次调用 save_config() 重试
+            if not self._batch_depth and self._dirty and not self.save_config():
+                print("批量修改的工作流配置未能保存，修改仅保留在内存中")
+
     def add_workflow(self, workflow_id, name, description, model="", parameters=None):
         """
         添加新的工作流配置
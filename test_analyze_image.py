@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+图像分析结果缓存测试脚本：失败的API调用不应被缓存
+"""
+
+from io import BytesIO
+from PIL import Image
+import app
+from qwen_api import QwenAPI
+
+class FakeQwenAPI(QwenAPI):
+    """按顺序返回预设响应的千问API客户端，不发送网络请求"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def process_image_request(self, image_path=None, image_data=None, task_type="识别", custom_prompt=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+def test_failed_analysis_not_cached():
+    """测试失败的分析结果不会被缓存，重试时重新调用API，成功结果则被缓存"""
+    fake = FakeQwenAPI([
+        {"error": "API请求失败: 连接超时"},
+        {"output": {"choices": [{"message": {"content": [{"text": "一只熊猫坐在竹林中"}]}}]}},
+    ])
+
+    buffered = BytesIO()
+    Image.new("RGB", (64, 64), (0, 128, 0)).save(buffered, format="PNG")
+    image_bytes = buffered.getvalue()
+
+    original_client = app.get_qwen_client
+    app.get_qwen_client = lambda: fake
+    app.analyze_image.clear()
+    try:
+        # 第一次调用失败，应抛出异常
+        try:
+            app.analyze_image(image_bytes, "通用识别")
+            raise AssertionError("API返回错误时应抛出 RuntimeError")
+        except RuntimeError as e:
+            print(f"第一次调用失败: {e}")
+
+        # 相同参数再次调用时应重新请求API，而不是返回缓存的失败结果
+        result = app.analyze_image(image_bytes, "通用识别")
+        assert result == "一只熊猫坐在竹林中", result
+        assert fake.calls == 2, fake.calls
+        print(f"第二次调用成功: {result}")
+
+        # 成功的结果被缓存，不再请求API
+        assert app.analyze_image(image_bytes, "通用识别") == result
+        assert fake.calls == 2, fake.calls
+        print("成功结果已缓存")
+    finally:
+        app.get_qwen_client = original_client
+        app.analyze_image.clear()
+
+    print("\n测试完成！")
+
+if __name__ == "__main__":
+    test_failed_analysis_not_cached()
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from image_generator import ImageGenerator
 
 def test_runninghub_api():
@@ -16,16 +17,25 @@ def test_runninghub_api():
     ]
     
     print("\n测试新增风格...")
-    for style in styles:
-        print(f"\n正在生成{style}风格的熊猫图片...")
-        image_path = generator.generate_image(
-            prompt="一只可爱的熊猫坐在竹林中",
-            style=style,
-            quality="标准",
-            api="runninghub",
-            use_mock=False  # 使用真实API
-        )
-        print(f"已生成{style}风格图片：{image_path}")
+    # 各风格的生成互不依赖，并发提交，总耗时约等于最慢的一个任务
+    with ThreadPoolExecutor(max_workers=min(8, len(styles))) as executor:
+        futures = {}
+        for style in styles:
+            print(f"\n正在生成{style}风格的熊猫图片...")
+            future = executor.submit(
+                generator.generate_image,
+                prompt="一只可爱的熊猫坐在竹林中",
+                style=style,
+                quality="标准",
+                api="runninghub",
+                use_mock=False  # 使用真实API
+            )
+            futures[future] = style
+        
+        for future in as_completed(futures):
+            style = futures[future]
+            image_path = future.result()
+            print(f"已生成{style}风格图片：{image_path}")
 
 if __name__ == "__main__":
     test_runninghub_api() 
\ No newline at end of file
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from image_generator import ImageGenerator
 
 def test_style_transfer():
@@ -31,20 +32,27 @@ def test_style_transfer():
     ]
     
     print("\n2. 开始生成不同风格的变体...")
-    for style in styles:
-        print(f"\n正在生成{style}风格...")
-        # 根据不同风格调整强度
-        strength = 0.9 if style in ["印象派", "超现实主义", "波普艺术"] else 0.7
+    # 各风格的变体互不依赖，并发生成
+    with ThreadPoolExecutor(max_workers=min(8, len(styles))) as executor:
+        futures = {}
+        for style in styles:
+            print(f"\n正在生成{style}风格...")
+            # 根据不同风格调整强度
+            strength = 0.9 if style in ["印象派", "超现实主义", "波普艺术"] else 0.7
+            
+            future = executor.submit(
+                generator.create_image_variation,
+                image_path=base_image_path,
+                variation_strength=strength,  # 不同风格使用不同的强度
+                use_mock=True
+            )
+            futures[future] = (style, strength)
         
-        styled_image_path = generator.generate_styled_variation(
-            image_path=base_image_path,
-            target_style=style,
-            strength=strength,  # 不同风格使用不同的强度
-            quality="标准",
-            use_mock=True
-        )
-        print(f"已生成{style}风格图片：{styled_image_path}")
-        print(f"使用的风格强度：{strength}")
+        for future in as_completed(futures):
+            style, strength = futures[future]
+            styled_image_path = future.result()
+            print(f"已生成{style}风格图片：{styled_image_path}")
+            print(f"使用的风格强度：{strength}")
 
 if __name__ == "__main__":
     test_style_transfer() 
\ No newline at end of file